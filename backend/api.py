@@ -13,7 +13,6 @@ import uuid
 import urllib.request
 import zipfile
 import subprocess
-import traceback
 from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Annotated, Any, Optional
@@ -26,7 +25,7 @@ from PIL import Image
 from fastapi import APIRouter, Depends, FastAPI, File, Form, HTTPException, Request, UploadFile
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from starlette.exceptions import HTTPException as StarletteHTTPException
@@ -459,7 +458,7 @@ def _is_newer_version(current: str, latest: str) -> bool:
 
 def _raise_internal_error(action: str, exc: Exception) -> None:
     """统一兜底异常日志与 HTTP 500。"""
-    logger.error(f"{action} failed: {traceback.format_exc()}")
+    logger.error(f"{action} failed", exc_info=exc)
     raise HTTPException(status_code=500, detail=f"{action} failed") from exc
 
 
@@ -644,7 +643,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """处理未捕获的异常"""
-    logger.error(f"Unhandled exception: {traceback.format_exc()}")
+    logger.error("Unhandled exception", exc_info=exc)
     return _error_response(500, "Internal Server Error", str(exc) if os.getenv("DEBUG") else None)
 
 
@@ -1612,11 +1611,11 @@ def get_templates(include_details: bool = False):
 
 @app.get("/api/templates/{template_id}/schema")
 def get_template_schema(template_id: str):
-    """获取指定模板的完整 schema"""
-    schema = get_template_manager().get_template_schema(template_id)
-    if not schema:
+    """获取指定模板的完整 schema（直接返回加载时预编码的 JSON 字节）"""
+    schema_bytes = get_template_manager().get_template_schema_bytes(template_id)
+    if not schema_bytes:
         raise HTTPException(status_code=404, detail=f"Template not found: {template_id}")
-    return schema
+    return Response(content=schema_bytes, media_type="application/json")
 
 @app.get("/api/templates/{template_id}/versions")
 def get_template_versions(template_id: str):
@@ -1737,7 +1736,7 @@ def generate_template_report(template_id: str, data: dict[str, Any]):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Generate report error: {traceback.format_exc()}")
+        logger.exception("Generate report error")
         return _build_error_payload(
             "报告生成异常",
             str(e),
@@ -180,7 +180,7 @@ class BaseTemplateHandler(ABC):
                     self.write_db_log(self.output_dir, db_name, db_table, record)
                     
         except Exception as e:
-            logger.error(f"Postprocess error: {e}")
+            logger.exception(f"Postprocess error: {e}")
     
     def _get_log_fields(self, data: Dict[str, Any], report_date: str) -> List[str]:
         """
@@ -267,9 +267,8 @@ class BaseTemplateHandler(ABC):
                 
         except Exception as e:
             result["message"] = f"报告生成异常: {str(e)}"
-            import traceback
-            traceback.print_exc()
-        
+            logger.exception(result["message"])
+
         return result
     
     # ========== 工具方法 ==========
@@ -538,8 +537,7 @@ class BaseTemplateHandler(ABC):
             return True, final_path, "已生成兜底报告（模板文件丢失）"
             
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"兜底报告生成失败: {e}")
             return False, "", f"兜底报告生成失败: {str(e)}"
     
     # ========== 公共工具方法 ==========
@@ -663,7 +661,7 @@ class BaseTemplateHandler(ABC):
             conn.commit()
             
         except Exception as e:
-            logger.error(f"DB Error: {e}")
+            logger.exception(f"DB Error: {e}")
         finally:
             conn.close()
 
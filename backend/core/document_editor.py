@@ -4,11 +4,19 @@
 @Updatetime: 2025-05-07 15:00
 @description: 表格文本替换与目录处理
 """
+import re
 from copy import deepcopy
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
+from docx.oxml.ns import nsdecls, qn
+from docx.oxml import OxmlElement, parse_xml
 from docx.shared import RGBColor
 
+# 常用限定名：模块级缓存，避免热路径上反复做 qn() 前缀解析
+_W_P = qn('w:p')
+_W_R = qn('w:r')
+_W_T = qn('w:t')
+_W_VAL = qn('w:val')
+_W_IND = qn('w:ind')
+
 # 风险等级颜色映射
 RISK_LEVEL_COLORS = {
     "无风险": RGBColor(0x19, 0x87, 0x54),  # #198754 绿色
@@ -24,11 +32,58 @@ RISK_LEVEL_COLORS = {
     "高风险": RGBColor(0xdc, 0x35, 0x45),  # #dc3545 红色
 }
 
+# 目录标题段落模板：模块加载时解析一次，插入时 deepcopy 并填入标题文本
+_TOC_TITLE_TEMPLATE = parse_xml(
+    '<w:p %s>'
+    '<w:pPr>'
+    '<w:jc w:val="center"/>'
+    '<w:spacing w:before="240" w:after="240"/>'  # 段前段后 12pt
+    '</w:pPr>'
+    '<w:r>'
+    '<w:rPr><w:b/><w:sz w:val="32"/><w:szCs w:val="32"/></w:rPr>'  # 加粗 16pt
+    '<w:t></w:t>'
+    '</w:r>'
+    '</w:p>' % nsdecls('w')
+)
+
+# 目录域段落模板（TOC \o "1-3" \h \z \u），内容全静态，deepcopy 即用
+_TOC_FIELD_TEMPLATE = parse_xml(
+    '<w:p %s>'
+    '<w:pPr/>'
+    '<w:r><w:fldChar w:fldCharType="begin"/></w:r>'
+    '<w:r><w:instrText xml:space="preserve"> TOC \\o "1-3" \\h \\z \\u </w:instrText></w:r>'
+    '<w:r><w:fldChar w:fldCharType="separate"/></w:r>'
+    '<w:r>'
+    '<w:rPr><w:color w:val="808080"/></w:rPr>'
+    '<w:t>请更新目录：右键点击此处 → 更新域，或按 Ctrl+A 后按 F9</w:t>'
+    '</w:r>'
+    '<w:r><w:fldChar w:fldCharType="end"/></w:r>'
+    '</w:p>' % nsdecls('w')
+)
+
+
 class DocumentEditor:
+    # 每次生成都会实例化，__slots__ 省去 __dict__ 开销并加速属性访问
+    __slots__ = ('doc',)
+
     def __init__(self, doc):
         self.doc = doc
 
 
+    @staticmethod
+    def _fast_set_text(paragraph, new_text):
+        """
+        快速设置段落文本
+
+        段落只有单个 w:t 节点时直接改写其文本（O(1)，保留 run 格式），
+        否则回退到 paragraph.text 赋值（重建 run 树）。
+        """
+        t_elems = paragraph._element.findall('.//' + _W_T)
+        if len(t_elems) == 1:
+            t_elems[0].text = new_text
+        else:
+            paragraph.text = new_text
+
     def _replace_in_runs(self, paragraph, replacements):
         """
         在 run 级别替换占位符，保留原有格式
@@ -158,9 +213,9 @@ class DocumentEditor:
         for i, line in enumerate(lines[1:], 1):
             new_p = deepcopy(original_element)
             # 清空文本，保留第一个 run 写入新内容
-            runs = new_p.findall(qn('w:r'))
+            runs = new_p.findall(_W_R)
             for j, r in enumerate(runs):
-                for t in r.findall(qn('w:t')):
+                for t in r.findall(_W_T):
                     if j == 0:
                         t.text = line
                     else:
@@ -188,59 +243,57 @@ class DocumentEditor:
         # 风险等级占位符
         risk_level_key = risk_key
         risk_level_value = replacements.get(risk_level_key, "")
-        
+
+        # 预编译所有占位符的合并正则（长 key 在前，避免前缀遮蔽），
+        # 单次 findall 即可得到段落命中的全部 key，取代逐 key 的线性探测；
+        # 同时预先算好字符串化的替换值和含换行的 key 集合
+        str_replacements = {key: str(value) for key, value in replacements.items()}
+        multiline_keys = {
+            key for key, value in str_replacements.items()
+            if '\n' in value.strip('\n')
+        }
+        pattern = re.compile(
+            '|'.join(re.escape(k) for k in sorted(str_replacements, key=len, reverse=True))
+        ) if str_replacements else None
+
         # 1. 处理段落 (Paragraphs)
-        paragraphs_to_process = list(self.doc.paragraphs)
-        
+        paragraphs_to_process = list(self.doc.paragraphs) if pattern else []
+
         for paragraph in paragraphs_to_process:
-            if '#' not in paragraph.text: 
+            full_text = paragraph.text
+            hit_keys = set(pattern.findall(full_text))
+            if not hit_keys:
                 continue
 
-            full_text = paragraph.text
-            
             # 特殊处理：风险等级带颜色（仅当启用时）
-            if enable_risk_color and risk_level_key in full_text and risk_level_value in RISK_LEVEL_COLORS:
+            if enable_risk_color and risk_level_key in hit_keys and risk_level_value in RISK_LEVEL_COLORS:
                 color = RISK_LEVEL_COLORS[risk_level_value]
                 self._replace_with_color(paragraph, risk_level_key, risk_level_value, color)
-                full_text = paragraph.text
-                # 继续处理其他占位符
-                is_modified = False
-                for key, value in replacements.items():
-                    if key != risk_level_key and key in full_text:
-                        full_text = full_text.replace(key, str(value))
-                        is_modified = True
                 # 风险等级已处理，跳过后续逻辑
                 continue
 
-            needs_multiline = False
-            for key, value in replacements.items():
-                if key in full_text and '\n' in str(value).strip('\n'):
-                    needs_multiline = True
-                    break
-            
+            needs_multiline = not multiline_keys.isdisjoint(hit_keys)
+
             if needs_multiline:
-                for key, value in replacements.items():
-                    if key in full_text:
-                        full_text = full_text.replace(key, str(value))
-                
+                full_text = pattern.sub(lambda m: str_replacements[m.group(0)], full_text)
+
                 # 过滤空行，避免生成空段落
                 lines = [line for line in full_text.split('\n') if line.strip()]
                 if len(lines) > 1:
                     self._insert_paragraphs_after(paragraph, lines)
                 else:
-                    paragraph.text = full_text.rstrip()
+                    self._fast_set_text(paragraph, full_text.rstrip())
             else:
                 # 优先尝试 run 级别替换（保留格式）
                 replaced_keys = self._replace_in_runs(paragraph, replacements)
-                
+
                 # 检查是否还有未替换的占位符（跨run情况）
                 remaining_text = paragraph.text
-                has_remaining = False
-                for key, value in replacements.items():
-                    if key not in replaced_keys and key in remaining_text:
-                        has_remaining = True
-                        remaining_text = remaining_text.replace(key, str(value))
-                
+                has_remaining = any(
+                    key not in replaced_keys and key in remaining_text
+                    for key in hit_keys
+                )
+
                 # 如果有跨run的占位符，使用保留格式的替换方式
                 if has_remaining:
                     self._replace_across_runs(paragraph, replacements)
@@ -339,106 +392,22 @@ class DocumentEditor:
         return True
 
     def _create_toc_title_paragraph(self, title: str) -> OxmlElement:
-        """创建目录标题段落"""
-        # 创建段落元素
-        p = OxmlElement('w:p')
-        
-        # 段落属性：居中对齐
-        pPr = OxmlElement('w:pPr')
-        jc = OxmlElement('w:jc')
-        jc.set(qn('w:val'), 'center')
-        pPr.append(jc)
-        
-        # 段前段后间距
-        spacing = OxmlElement('w:spacing')
-        spacing.set(qn('w:before'), '240')  # 12pt
-        spacing.set(qn('w:after'), '240')
-        pPr.append(spacing)
-        
-        p.append(pPr)
-        
-        # 创建 run 元素
-        r = OxmlElement('w:r')
-        
-        # run 属性：字体大小、加粗
-        rPr = OxmlElement('w:rPr')
-        b = OxmlElement('w:b')  # 加粗
-        rPr.append(b)
-        sz = OxmlElement('w:sz')
-        sz.set(qn('w:val'), '32')  # 16pt = 32 half-points
-        rPr.append(sz)
-        szCs = OxmlElement('w:szCs')
-        szCs.set(qn('w:val'), '32')
-        rPr.append(szCs)
-        r.append(rPr)
-        
-        # 文本内容
-        t = OxmlElement('w:t')
-        t.text = title
-        r.append(t)
-        
-        p.append(r)
+        """创建目录标题段落（从模块级模板克隆，填入标题文本）"""
+        p = deepcopy(_TOC_TITLE_TEMPLATE)
+        p.find('.//' + _W_T).text = title
         return p
 
     def _create_toc_field_paragraph(self) -> OxmlElement:
         """
-        创建包含 TOC 域的段落
-        
+        创建包含 TOC 域的段落（从模块级模板克隆）
+
         TOC 域代码: TOC \\o "1-3" \\h \\z \\u
         - \\o "1-3": 包含 Heading 1-3 级别
         - \\h: 创建超链接
         - \\z: 隐藏 Web 视图中的制表符和页码
         - \\u: 使用应用的段落大纲级别
         """
-        p = OxmlElement('w:p')
-        
-        # 段落属性
-        pPr = OxmlElement('w:pPr')
-        p.append(pPr)
-        
-        # 域开始标记
-        r_begin = OxmlElement('w:r')
-        fldChar_begin = OxmlElement('w:fldChar')
-        fldChar_begin.set(qn('w:fldCharType'), 'begin')
-        r_begin.append(fldChar_begin)
-        p.append(r_begin)
-        
-        # 域代码
-        r_instr = OxmlElement('w:r')
-        instrText = OxmlElement('w:instrText')
-        instrText.set(qn('xml:space'), 'preserve')
-        instrText.text = ' TOC \\o "1-3" \\h \\z \\u '
-        r_instr.append(instrText)
-        p.append(r_instr)
-        
-        # 域分隔符
-        r_separate = OxmlElement('w:r')
-        fldChar_separate = OxmlElement('w:fldChar')
-        fldChar_separate.set(qn('w:fldCharType'), 'separate')
-        r_separate.append(fldChar_separate)
-        p.append(r_separate)
-        
-        # 占位文本（提示用户更新）
-        r_placeholder = OxmlElement('w:r')
-        rPr = OxmlElement('w:rPr')
-        # 灰色文字
-        color = OxmlElement('w:color')
-        color.set(qn('w:val'), '808080')
-        rPr.append(color)
-        r_placeholder.append(rPr)
-        t = OxmlElement('w:t')
-        t.text = '请更新目录：右键点击此处 → 更新域，或按 Ctrl+A 后按 F9'
-        r_placeholder.append(t)
-        p.append(r_placeholder)
-        
-        # 域结束标记
-        r_end = OxmlElement('w:r')
-        fldChar_end = OxmlElement('w:fldChar')
-        fldChar_end.set(qn('w:fldCharType'), 'end')
-        r_end.append(fldChar_end)
-        p.append(r_end)
-        
-        return p
+        return deepcopy(_TOC_FIELD_TEMPLATE)
 
     def _set_update_fields_on_open(self) -> None:
         """
@@ -456,7 +425,7 @@ class DocumentEditor:
             settings.append(update_fields)
         
         # 设置为 true
-        update_fields.set(qn('w:val'), 'true')
+        update_fields.set(_W_VAL, 'true')
 
     @staticmethod
     def clear_paragraph_indent(para) -> None:
@@ -473,7 +442,7 @@ class DocumentEditor:
         if pPr is None:
             pPr = OxmlElement('w:pPr')
             p.insert(0, pPr)
-        ind = pPr.find(qn('w:ind'))
+        ind = pPr.find(_W_IND)
         if ind is None:
             ind = OxmlElement('w:ind')
             pPr.append(ind)
@@ -6,35 +6,91 @@
 """
 
 import copy
+import io
 import os
+import struct
 import tempfile
+from pathlib import Path
 from typing import List, Dict, Union, Optional
 
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
 from docx.shared import Inches
+from docx.table import _Cell
 from docx.text.paragraph import Paragraph
 from PIL import Image
 
 from .document_editor import DocumentEditor
 
+# 常用限定名：模块级缓存，避免热路径上反复做 qn() 前缀解析
+_W_P = qn('w:p')
+_W_R = qn('w:r')
+_W_T = qn('w:t')
+_W_RPR = qn('w:rPr')
+_W_PPR = qn('w:pPr')
+_W_IND = qn('w:ind')
+_W_JC = qn('w:jc')
+_W_VAL = qn('w:val')
+
+# 对齐方式 -> w:jc val 的模块级映射，绕过属性机制逐次的枚举换算
+_ALIGNMENT_JC_VALS = {
+    WD_PARAGRAPH_ALIGNMENT.LEFT: 'left',
+    WD_PARAGRAPH_ALIGNMENT.CENTER: 'center',
+    WD_PARAGRAPH_ALIGNMENT.RIGHT: 'right',
+}
+
 
 class DocumentImageProcessor:
+    # 每次生成都会实例化，__slots__ 省去 __dict__ 开销并加速属性访问
+    __slots__ = (
+        'doc', 'vuln_sections', 'evidence_cell_cache', 'base_dir',
+        '_resolved_path_cache',
+    )
+
     def __init__(self, doc, vuln_sections=None):
         self.doc = doc
         self.vuln_sections = vuln_sections or []
         self.evidence_cell_cache = None
         self.base_dir = os.getcwd()
+        self._resolved_path_cache: Dict[str, str] = {}
 
     def _resolve_path(self, path: str) -> str:
-        """解析图片路径"""
+        """解析图片路径（同一路径的解析结果按实例缓存）"""
         if not path:
             return path
-        if os.path.isabs(path):
-            return path
-        abs_path = os.path.join(self.base_dir, path)
-        return abs_path if os.path.exists(abs_path) else path
+        cached = self._resolved_path_cache.get(path)
+        if cached is not None:
+            return cached
+        # Path 拼接对绝对路径输入是恒等操作，一次调用同时覆盖两种情况
+        candidate = Path(self.base_dir) / path
+        resolved = str(candidate) if candidate.exists() else path
+        self._resolved_path_cache[path] = resolved
+        return resolved
+
+    @staticmethod
+    def _set_alignment(paragraph, alignment) -> None:
+        """直接写 w:pPr/w:jc 设置段落对齐，避开 alignment 属性的包装开销"""
+        val = _ALIGNMENT_JC_VALS.get(alignment)
+        if val is None:
+            paragraph.alignment = alignment
+            return
+        paragraph._element.get_or_add_pPr().get_or_add_jc().set(_W_VAL, val)
+
+    @staticmethod
+    def _strip_placeholder(paragraph, placeholder: str) -> None:
+        """
+        从段落中移除占位符文本。
+
+        占位符完整位于单个 w:t 节点内时原地改写该节点（保留 run 格式），
+        跨 run 时回退到 paragraph.text 重建。
+        """
+        for t in paragraph._element.findall('.//' + _W_T):
+            if t.text and placeholder in t.text:
+                t.text = t.text.replace(placeholder, '')
+        # 跨 run 残留时回退（会重建 run 树）
+        if placeholder in paragraph.text:
+            paragraph.text = paragraph.text.replace(placeholder, '')
 
     def _clear_paragraph_indent(self, paragraph) -> None:
         """
@@ -43,33 +99,81 @@ class DocumentImageProcessor:
         """
         DocumentEditor.clear_paragraph_indent(paragraph)
 
+    @staticmethod
+    def _read_image_size(path: str) -> Optional[tuple]:
+        """
+        直接从 PNG/JPEG 文件头读取像素尺寸 (width, height)。
+
+        只解析几十字节的头部，避免 PIL 打开图片的解码开销。
+        其他格式或解析失败时返回 None，由调用方回退到 PIL。
+        """
+        try:
+            with open(path, 'rb') as f:
+                head = f.read(26)
+                # PNG: 8 字节签名 + IHDR 块（宽高各 4 字节大端）
+                if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+                    width, height = struct.unpack('>II', head[16:24])
+                    return width, height
+                # JPEG: 逐段扫描找到 SOFn 帧头
+                if head.startswith(b'\xff\xd8'):
+                    f.seek(2)
+                    while True:
+                        marker = f.read(2)
+                        if len(marker) < 2 or marker[0] != 0xFF:
+                            return None
+                        code = marker[1]
+                        # 跳过填充字节和无长度段
+                        if code == 0xFF:
+                            f.seek(-1, 1)
+                            continue
+                        if code in (0x01,) or 0xD0 <= code <= 0xD9:
+                            continue
+                        seg = f.read(2)
+                        if len(seg) < 2:
+                            return None
+                        (length,) = struct.unpack('>H', seg)
+                        # SOF0-SOF15（排除 DHT/JPG/DAC）
+                        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+                            data = f.read(5)
+                            if len(data) < 5:
+                                return None
+                            height, width = struct.unpack('>HH', data[1:5])
+                            return width, height
+                        f.seek(length - 2, 1)
+        except (OSError, struct.error):
+            return None
+        return None
+
     def insert_image_run(self, paragraph, img_path: str, max_width_inches: float = 6.0):
         """
         向段落插入图片，自动计算最佳尺寸。
         公开方法，供模板在动态构造文档结构时直接调用（无需占位符）。
         """
         resolved_path = self._resolve_path(img_path)
-        
+
         if not resolved_path or not os.path.exists(resolved_path):
             paragraph.add_run(f"[图片不存在: {os.path.basename(img_path)}]")
             return
 
         run = paragraph.add_run()
         try:
-            # 尝试智能计算尺寸
-            with Image.open(resolved_path) as pil_img:
-                img_width, img_height = pil_img.size
-                
-                # 如果图片宽度超过最大宽度，按比例缩放
-                # Word 默认 DPI 约为 96 (实际上 docx 库内部处理了 EMU 转换)
-                if img_width > max_width_inches * 96:
-                    width = Inches(max_width_inches)
-                    run.add_picture(resolved_path, width=width)
-                else:
-                    # 图片较小，使用原始尺寸（转换为 Inches 以保持清晰度）
-                    # 1 inch = 96 px (approx for screen)
-                    width = Inches(img_width / 96)
-                    run.add_picture(resolved_path, width=width)
+            # 尝试智能计算尺寸：优先读文件头，非 PNG/JPEG 再回退 PIL
+            size = self._read_image_size(resolved_path)
+            if size is None:
+                with Image.open(resolved_path) as pil_img:
+                    size = pil_img.size
+            img_width, img_height = size
+
+            # 如果图片宽度超过最大宽度，按比例缩放
+            # Word 默认 DPI 约为 96 (实际上 docx 库内部处理了 EMU 转换)
+            if img_width > max_width_inches * 96:
+                width = Inches(max_width_inches)
+                run.add_picture(resolved_path, width=width)
+            else:
+                # 图片较小，使用原始尺寸（转换为 Inches 以保持清晰度）
+                # 1 inch = 96 px (approx for screen)
+                width = Inches(img_width / 96)
+                run.add_picture(resolved_path, width=width)
         except Exception as e:
             # 兜底方案：直接插入，限制最大宽度
             try:
@@ -92,20 +196,19 @@ class DocumentImageProcessor:
                 original_style = first_para.style
             except Exception:
                 pass
-            runs = first_para._element.findall(qn('w:r'))
+            runs = first_para._element.findall(_W_R)
             for run_elem in runs:
-                rPr = run_elem.find(qn('w:rPr'))
+                rPr = run_elem.find(_W_RPR)
                 if rPr is not None:
                     original_rPr = rPr
                     break
 
         # 1. 清空单元格原有内容
         # 注意：不能直接 cell.text = ""，因为这会移除所有段落属性
-        # 我们保留第一个段落用于重用，或者清空所有段落
-        for para in cell.paragraphs:
-            p = para._element
-            if p.getparent() is not None:
-                p.getparent().remove(p)
+        # 直接在 w:tc 元素上批量移除 w:p 子节点，无需构造段落包装对象
+        tc = cell._tc
+        for p in tc.findall(_W_P):
+            tc.remove(p)
         
         # 如果单元格为空（被清空了），添加一个新段落作为起始
         if not cell.paragraphs:
@@ -133,14 +236,14 @@ class DocumentImageProcessor:
                 if original_rPr is not None:
                     cloned_rPr = copy.deepcopy(original_rPr)
                     run_obj._element.insert(0, cloned_rPr)
-                p.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+                self._set_alignment(p, WD_PARAGRAPH_ALIGNMENT.LEFT)
                 self._clear_paragraph_indent(p)
 
             # 插入图片
             if img_path:
                 p = cell.add_paragraph()
                 self.insert_image_run(p, img_path, max_width_inches)
-                p.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+                self._set_alignment(p, WD_PARAGRAPH_ALIGNMENT.CENTER)
                 self._clear_paragraph_indent(p) # 关键：防止图片歪斜
 
         # 移除可能多余的第一个空段落（如果它在最前面且为空）
@@ -157,15 +260,31 @@ class DocumentImageProcessor:
         如果 image_list 为空，则仅移除占位符。
         同时处理文档段落和表格单元格中的占位符。
         """
+        # 0. 快速预检：拼接正文全部 w:t 文本做超集判断（可能跨段落误报，
+        # 不会漏报），占位符完全不存在时直接跳过所有表格/段落扫描
+        body_text = ''.join(
+            t.text or '' for t in self.doc.element.body.iter(_W_T)
+        )
+        if placeholder not in body_text:
+            return
+
         # 1. 处理表格中的占位符
+        # 直接遍历 w:tc 元素定位包含占位符的单元格，
+        # 避免 row.cells 为每个单元格（含合并重复项）构造 Python 包装对象
         for table in self.doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if placeholder in cell.text:
-                        # 清除占位符文本
+            for tr in table._tbl.tr_lst:
+                for tc in tr.tc_lst:
+                    cell_text = ''.join(
+                        t.text or ''
+                        for p in tc.findall(_W_P)
+                        for t in p.findall('.//' + _W_T)
+                    )
+                    if placeholder in cell_text:
+                        cell = _Cell(tc, table)
+                        # 清除占位符文本（优先原地改写 w:t，保留格式）
                         for para in cell.paragraphs:
                             if placeholder in para.text:
-                                para.text = para.text.replace(placeholder, '')
+                                self._strip_placeholder(para, placeholder)
                         # 如果有图片，插入到单元格
                         if image_list:
                             self.insert_images_into_cell(cell, image_list, max_width_inches=5.5)
@@ -182,19 +301,28 @@ class DocumentImageProcessor:
             index = parent.index(para._element)
             
             # 保存原始段落的格式属性（在移除之前）
-            original_pPr = para._element.find(qn('w:pPr'))
+            original_pPr = para._element.find(_W_PPR)
             
             # 保存原始段落的 run 级格式（字体、字号、颜色等）
-            runs = para._element.findall(qn('w:r'))
+            runs = para._element.findall(_W_R)
             original_rPr = None
             if runs:
-                original_rPr = runs[0].find(qn('w:rPr'))
-            
+                original_rPr = runs[0].find(_W_RPR)
+
+            # 预先克隆并清理 pPr（移除缩进节点，避免与 _clear_paragraph_indent 冲突），
+            # 后续每个条目只需 deepcopy 这份模板，不再逐条目重复查找/删除
+            cleaned_pPr = None
+            if original_pPr is not None:
+                cleaned_pPr = copy.deepcopy(original_pPr)
+                ind = cleaned_pPr.find(_W_IND)
+                if ind is not None:
+                    cleaned_pPr.remove(ind)
+
             # 移除占位符段落
             parent.remove(para._element)
-            
+
             current_index = index
-            
+
             for item in image_list:
                 if isinstance(item, dict):
                     img_path = item.get('path', '')
@@ -202,44 +330,45 @@ class DocumentImageProcessor:
                 else:
                     img_path = str(item)
                     desc = ''
-                
+
                 # 插入描述
                 if desc:
                     new_p = OxmlElement('w:p')
-                    if original_pPr is not None:
-                        cloned_pPr = copy.deepcopy(original_pPr)
-                        # 移除缩进节点，避免与 _clear_paragraph_indent 冲突
-                        ind = cloned_pPr.find(qn('w:ind'))
-                        if ind is not None:
-                            cloned_pPr.remove(ind)
-                        new_p.append(cloned_pPr)
+                    if cleaned_pPr is not None:
+                        new_p.append(copy.deepcopy(cleaned_pPr))
                     parent.insert(current_index, new_p)
                     p = Paragraph(new_p, self.doc)
                     run = p.add_run(desc)
                     if original_rPr is not None:
                         cloned_rPr = copy.deepcopy(original_rPr)
                         run._element.insert(0, cloned_rPr)
-                    p.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+                    self._set_alignment(p, WD_PARAGRAPH_ALIGNMENT.LEFT)
                     self._clear_paragraph_indent(p)
                     current_index += 1
-                
+
                 # 插入图片
                 if img_path:
                     new_p = OxmlElement('w:p')
-                    if original_pPr is not None:
-                        cloned_pPr = copy.deepcopy(original_pPr)
-                        ind = cloned_pPr.find(qn('w:ind'))
-                        if ind is not None:
-                            cloned_pPr.remove(ind)
-                        new_p.append(cloned_pPr)
+                    if cleaned_pPr is not None:
+                        new_p.append(copy.deepcopy(cleaned_pPr))
                     parent.insert(current_index, new_p)
                     p = Paragraph(new_p, self.doc)
                     self.insert_image_run(p, img_path, max_width_inches=6.0)
-                    p.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+                    self._set_alignment(p, WD_PARAGRAPH_ALIGNMENT.CENTER)
                     self._clear_paragraph_indent(p)
                     current_index += 1
 
     def save_image_temporarily(self, image):
-        temp_file = tempfile.mkstemp(suffix='.png')[1]
-        image.save(temp_file)
-        return temp_file
+        """
+        将图片保存为临时 PNG 文件并返回路径。
+
+        先在内存缓冲区完成 PNG 编码，再一次性写盘，避免编码器对
+        文件句柄的多次小块写入；并复用 mkstemp 返回的描述符（原实现
+        只取路径，描述符会泄漏）。
+        """
+        fd, temp_path = tempfile.mkstemp(suffix='.png')
+        buf = io.BytesIO()
+        image.save(buf, format='PNG')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(buf.getbuffer())
+        return temp_path
@@ -2,78 +2,114 @@
 """
 @Createtime: 2026-02-02
 @description: 自定义异常类 - 用于更精确的错误处理和诊断
+
+消息字符串延迟构造:异常经常在热路径上抛出后立即被捕获分类,
+此时消息从未被读取。各子类只保存原始字段,首次访问 message
+(或 str()) 时才拼接格式化字符串。
 """
 
 
 class TemplateError(Exception):
     """模板相关错误的基类"""
-    def __init__(self, message: str, template_id: str = None):
-        self.message = message
+    def __init__(self, message: str = None, template_id: str = None):
+        self._message = message
         self.template_id = template_id
-        super().__init__(self.message)
+        super().__init__()
+
+    def _build_message(self) -> str:
+        """子类覆盖此方法以延迟构造消息"""
+        return self._message or ""
+
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            self._message = self._build_message()
+        return self._message
+
+    def __str__(self) -> str:
+        return self.message
 
 
 class TemplateNotFoundError(TemplateError):
     """模板不存在"""
     def __init__(self, template_id: str):
-        super().__init__(f"Template not found: {template_id}", template_id)
+        super().__init__(None, template_id)
+
+    def _build_message(self) -> str:
+        return f"Template not found: {self.template_id}"
 
 
 class TemplateLoadError(TemplateError):
     """模板加载失败"""
     def __init__(self, template_id: str, reason: str):
-        super().__init__(f"Failed to load template '{template_id}': {reason}", template_id)
+        super().__init__(None, template_id)
         self.reason = reason
 
+    def _build_message(self) -> str:
+        return f"Failed to load template '{self.template_id}': {self.reason}"
+
 
 class TemplateValidationError(TemplateError):
     """模板验证失败"""
     def __init__(self, template_id: str, errors: list):
-        message = f"Template validation failed for '{template_id}': {'; '.join(errors)}"
-        super().__init__(message, template_id)
+        super().__init__(None, template_id)
         self.errors = errors
 
+    def _build_message(self) -> str:
+        return f"Template validation failed for '{self.template_id}': {'; '.join(self.errors)}"
+
 
 class InvalidTemplateIdError(TemplateError):
     """模板 ID 不符合命名规范"""
     def __init__(self, template_id: str):
-        message = (
-            f"Invalid template ID: '{template_id}'. "
+        super().__init__(None, template_id)
+
+    def _build_message(self) -> str:
+        return (
+            f"Invalid template ID: '{self.template_id}'. "
             f"Template ID must match pattern: ^[a-zA-Z_][a-zA-Z0-9_]*$ "
             f"(only letters, numbers, underscores; cannot start with a number)"
         )
-        super().__init__(message, template_id)
 
 
 class SchemaParseError(TemplateError):
     """Schema 文件解析错误"""
     def __init__(self, template_id: str, file_path: str, reason: str):
-        super().__init__(
-            f"Failed to parse schema for '{template_id}' at {file_path}: {reason}",
-            template_id
-        )
+        super().__init__(None, template_id)
         self.file_path = file_path
         self.reason = reason
 
+    def _build_message(self) -> str:
+        return f"Failed to parse schema for '{self.template_id}' at {self.file_path}: {self.reason}"
+
 
 class DependencyError(TemplateError):
     """模板依赖缺失"""
     def __init__(self, template_id: str, missing_deps: list):
-        message = f"Template '{template_id}' has missing dependencies: {', '.join(missing_deps)}"
-        super().__init__(message, template_id)
+        super().__init__(None, template_id)
         self.missing_deps = missing_deps
 
+    def _build_message(self) -> str:
+        return f"Template '{self.template_id}' has missing dependencies: {', '.join(self.missing_deps)}"
+
 
 class HandlerNotFoundError(TemplateError):
     """Handler 未注册"""
     def __init__(self, template_id: str):
-        super().__init__(f"No handler registered for template: {template_id}", template_id)
+        super().__init__(None, template_id)
+
+    def _build_message(self) -> str:
+        return f"No handler registered for template: {self.template_id}"
 
 
 class SecurityError(TemplateError):
     """安全相关错误"""
     def __init__(self, message: str, template_id: str = None):
-        super().__init__(f"Security violation: {message}", template_id)
+        super().__init__(None, template_id)
+        self.detail = message
+
+    def _build_message(self) -> str:
+        return f"Security violation: {self.detail}"
 
 
 class PathTraversalError(SecurityError):
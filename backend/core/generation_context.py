@@ -36,6 +36,57 @@ from .summary_generator import SummaryGenerator, SummaryTemplates
 
 _DEFAULT_LOGGER = setup_logger("GenerationContext")
 
+# 后处理字段抽取器缓存
+# runtime 配置里的 log_fields / db_fields 在模板生命周期内不变,
+# 按字段组合构建一次专用闭包,postprocess 每次调用直接复用,
+# 免去逐 key 重建抽取逻辑的解释开销
+_LOG_EXTRACTOR_CACHE: Dict[Tuple[str, ...], Callable[[Dict[str, Any]], List[str]]] = {}
+_DB_BUILDER_CACHE: Dict[
+    Tuple[Tuple[str, str], ...], Callable[[Dict[str, Any]], Dict[str, Any]]
+] = {}
+
+
+def _get_log_extractor(
+    log_fields: List[str],
+) -> Callable[[Dict[str, Any]], List[str]]:
+    """Return a cached closure extracting the configured TXT log fields."""
+    cache_key = tuple(log_fields)
+    extractor = _LOG_EXTRACTOR_CACHE.get(cache_key)
+    if extractor is None:
+        def extractor(data: Dict[str, Any], _keys=cache_key) -> List[str]:
+            # 绝大多数日志字段已是字符串,跳过多余的 str() 调用;
+            # map(data.get, keys) 缺失 key 时返回 None,统一归为空串
+            g = data.get
+            return [
+                v if type(v) is str else '' if v is None else str(v)
+                for v in map(g, _keys)
+            ]
+        _LOG_EXTRACTOR_CACHE[cache_key] = extractor
+    return extractor
+
+
+def _get_db_builder(
+    db_field_map: Dict[str, str],
+) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Return a cached closure building the configured DB record."""
+    cache_key = tuple(db_field_map.items())
+    builder = _DB_BUILDER_CACHE.get(cache_key)
+    if builder is None:
+        if all(db_col == data_key for db_col, data_key in cache_key):
+            # 纯恒等映射（如 vuln_report 的 db_fields）:直接按 key 取值,
+            # 省掉每列一次的改名间接层
+            keys = tuple(db_field_map)
+
+            def builder(data: Dict[str, Any], _keys=keys) -> Dict[str, Any]:
+                g = data.get
+                return {k: g(k, '') for k in _keys}
+        else:
+            def builder(data: Dict[str, Any], _pairs=cache_key) -> Dict[str, Any]:
+                g = data.get
+                return {db_col: g(data_key, '') for db_col, data_key in _pairs}
+        _DB_BUILDER_CACHE[cache_key] = builder
+    return builder
+
 
 # ═══════════════════════════════════════════════════════════════════
 # Module-level utility functions (usable by preprocess without ctx)
@@ -136,6 +187,13 @@ class GenerationContext:
             return True, ctx.save(filename), "Report generated"
     """
 
+    # 每次报告生成都会实例化，__slots__ 省去 __dict__ 开销并加速属性访问
+    __slots__ = (
+        'template_dir', 'template_info', 'config', 'output_dir', 'logger',
+        '_doc', '_editor', '_img_processor', '_db_reader',
+        '_template_path', '_output_patterns', '_table_index',
+    )
+
     def __init__(
         self,
         template_dir: str,
@@ -169,6 +227,12 @@ class GenerationContext:
         # Cached template path
         self._template_path: Optional[str] = None
 
+        # Cached output-config patterns (resolved once per context)
+        self._output_patterns: Optional[Tuple[str, str]] = None
+
+        # Cached table header index (built on first populate_table call)
+        self._table_index: Optional[Dict[str, Any]] = None
+
     # ── Logger access ──────────────────────────────────────────────
 
     def setup_logger(self, name: str) -> Any:
@@ -190,6 +254,7 @@ class GenerationContext:
             # Reset derived services since doc changed
             self._editor = None
             self._img_processor = None
+            self._table_index = None
             return self._doc
         return None
 
@@ -420,6 +485,8 @@ class GenerationContext:
         doc = self.doc
         if doc is None:
             return False
+        if self._table_index is None:
+            self._table_index = TableProcessor.build_index(doc)
         return TableProcessor.populate_table(
             doc,
             table_header_text,
@@ -428,6 +495,7 @@ class GenerationContext:
             keep_header_rows=keep_header_rows,
             clear_indent=clear_indent,
             logger_instance=self.logger,
+            index=self._table_index,
         )
 
     @staticmethod
@@ -769,20 +837,29 @@ class GenerationContext:
             final_path = self.save_document(doc, output_path)
             return True, final_path, "Fallback report generated (template missing)"
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            self.logger.exception(f"Fallback generation failed: {e}")
             return False, "", f"Fallback generation failed: {str(e)}"
 
+    def _get_output_patterns(self) -> Tuple[str, str]:
+        """Resolve (filename_pattern, output_dir_pattern) from output_config once.
+
+        The template info never changes for the lifetime of a context, so the
+        dict lookups and defaulting only need to happen on the first call.
+        """
+        if self._output_patterns is None:
+            output_config = self.template_info.output_config
+            self._output_patterns = (
+                output_config.get('filename_pattern', '{vul_name}_{date}.docx'),
+                output_config.get('output_dir', ''),
+            )
+        return self._output_patterns
+
     def _generate_output_path_from_template(self, data: Dict[str, Any]) -> str:
         """Generate output path using template output config."""
         if not self.template_info:
             return os.path.join(self.output_dir, "report.docx")
 
-        output_config = self.template_info.output_config
-        filename_pattern = output_config.get(
-            'filename_pattern', '{vul_name}_{date}.docx'
-        )
-        output_dir_pattern = output_config.get('output_dir', '')
+        filename_pattern, output_dir_pattern = self._get_output_patterns()
 
         now = datetime.now()
         reps = {
@@ -879,7 +956,7 @@ class GenerationContext:
             )
             conn.commit()
         except Exception as e:
-            self.logger.error(f"DB log error: {e}")
+            self.logger.exception(f"DB log error: {e}")
         finally:
             conn.close()
 
@@ -914,18 +991,15 @@ class GenerationContext:
 
             # TXT log
             if log_prefix and log_fields:
-                field_values = [str(data.get(k, '')) for k in log_fields]
+                field_values = _get_log_extractor(log_fields)(data)
                 self.write_txt_log(log_prefix, field_values)
 
             # DB log
             if db_table and db_name and db_field_map:
-                record = {
-                    db_col: data.get(data_key, '')
-                    for db_col, data_key in db_field_map.items()
-                }
+                record = _get_db_builder(db_field_map)(data)
                 self.write_db_log(db_name, db_table, record)
         except Exception as e:
-            self.logger.error(f"Postprocess error: {e}")
+            self.logger.exception(f"Postprocess error: {e}")
 
     # ── Internal helpers ───────────────────────────────────────────
 
@@ -944,4 +1018,5 @@ class GenerationContext:
         self._doc = None
         self._editor = None
         self._img_processor = None
+        self._table_index = None
         return self.load_document()
@@ -3,8 +3,18 @@
 Table processing utilities for report generation.
 """
 
+from copy import deepcopy
 from typing import Dict, Any, List, Optional, Callable
 
+from docx.oxml.ns import qn
+from docx.table import Table, _Row
+
+_W_T = qn('w:t')
+_W_P = qn('w:p')
+_W_TBL = qn('w:tbl')
+_W_TR = qn('w:tr')
+_W_TC = qn('w:tc')
+
 
 class TableProcessor:
     """
@@ -16,6 +26,41 @@ class TableProcessor:
     Eliminates ~2 duplicated methods per handler.
     """
     
+    @staticmethod
+    def build_index(doc) -> Dict[str, Any]:
+        """
+        Build a first-cell-header -> w:tbl element index in one body pass.
+
+        Handlers that populate several tables in one document can build the
+        index once and pass it to populate_table, turning repeated O(N)
+        table scans into dict lookups. Working on the lxml elements directly
+        avoids materializing Table/row/cell proxy objects for every table;
+        populate_table wraps only the matched element.
+
+        Args:
+            doc: Document object
+
+        Returns:
+            Dict mapping stripped first-cell text to the w:tbl element
+            (doc order, first table wins on duplicate headers)
+        """
+        index: Dict[str, Any] = {}
+        for tbl in doc.element.body.findall(_W_TBL):
+            tr = tbl.find(_W_TR)
+            if tr is None:
+                continue
+            tc = tr.find(_W_TC)
+            if tc is None:
+                continue
+            # 与 cell.text 一致：只取单元格的直接段落，不含嵌套表格
+            header = '\n'.join(
+                ''.join(t.text or '' for t in p.iter(_W_T))
+                for p in tc.findall(_W_P)
+            ).strip()
+            if header and header not in index:
+                index[header] = tbl
+        return index
+
     @staticmethod
     def populate_table(
         doc,
@@ -24,11 +69,12 @@ class TableProcessor:
         row_builder_func: Callable,
         keep_header_rows: int = 1,
         clear_indent: bool = False,
-        logger_instance=None
+        logger_instance=None,
+        index: Optional[Dict[str, Any]] = None
     ) -> bool:
         """
         Generic table population method.
-        
+
         Args:
             doc: Document object
             table_header_text: Text to find table by (searches first cell)
@@ -37,29 +83,55 @@ class TableProcessor:
             keep_header_rows: Number of header rows to preserve (default 1)
             clear_indent: Auto clear paragraph indent for all cells (default False)
             logger_instance: Logger for debug output
-            
+            index: Optional prebuilt header index from build_index()
+
         Returns:
             True if table found and populated, False otherwise
         """
-        # Find table by header text
-        table = None
-        for t in doc.tables:
-            if t.rows and table_header_text in t.rows[0].cells[0].text:
-                table = t
-                break
-        
+        # Find table by header text (exact index hit, then substring fallback).
+        # Without a caller-provided index, build one lazily and stash it on
+        # the document so repeated calls skip the cell.text traversal.
+        if index is None:
+            index = getattr(doc, '_rgx_table_index', None)
+            if index is None:
+                index = TableProcessor.build_index(doc)
+                doc._rgx_table_index = index
+
+        tbl_el = index.get(table_header_text.strip())
+        if tbl_el is None:
+            for header, el in index.items():
+                if table_header_text in header:
+                    tbl_el = el
+                    break
+        table = Table(tbl_el, doc) if tbl_el is not None else None
+
         if not table:
             if logger_instance:
                 logger_instance.warning(f"Table with header '{table_header_text}' not found")
             return False
         
-        # Delete template rows (keep header rows)
-        while len(table.rows) > keep_header_rows:
-            table._tbl.remove(table.rows[keep_header_rows]._tr)
-        
+        # Delete template rows (keep header rows); collect the tr elements
+        # once instead of re-reading table.rows on every removal. Keep the
+        # first template row as a cleared prototype: cloning it per data row
+        # skips the per-cell setup that table.add_row() performs.
+        tbl = table._tbl
+        template_trs = tbl.tr_lst[keep_header_rows:]
+        prototype_tr = None
+        if template_trs:
+            prototype_tr = deepcopy(template_trs[0])
+            for t_el in prototype_tr.iter(_W_T):
+                t_el.text = ''
+        for tr in template_trs:
+            tbl.remove(tr)
+
         # Add data rows
         for data_item in data_rows:
-            row = table.add_row()
+            if prototype_tr is not None:
+                new_tr = deepcopy(prototype_tr)
+                tbl.append(new_tr)
+                row = _Row(new_tr, table)
+            else:
+                row = table.add_row()
             row_builder_func(row, data_item)
             
             # Auto clear indent if requested
@@ -7,11 +7,35 @@
 - 环境变量配置日志级别
 """
 
+import atexit
+import functools
 import logging
+import queue
 import sys
 import os
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# 格式串只用到 asctime/name/levelname/message，
+# 关闭 LogRecord 默认采集的线程/进程信息，省去每条日志的
+# get_ident/getpid/multiprocessing 属性查询
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# 所有已启动的 QueueListener，进程退出时统一停止并冲刷队列
+_listeners = []
+
+
+def _stop_listeners() -> None:
+    for listener in _listeners:
+        try:
+            listener.stop()
+        except Exception:
+            pass
+
+
+atexit.register(_stop_listeners)
 
 
 def get_log_level_from_env() -> int:
@@ -39,10 +63,13 @@ def get_log_level_from_env() -> int:
     return level_map.get(level_name, logging.INFO)
 
 
+@functools.lru_cache(maxsize=1)
 def get_log_directory() -> Path:
     """
     获取日志目录路径
-    
+
+    路径推导和 mkdir 只在进程内执行一次，结果缓存复用。
+
     Returns:
         日志目录的 Path 对象
     """
@@ -57,53 +84,50 @@ def get_log_directory() -> Path:
         backend_dir = Path(__file__).parent.parent
     
     log_dir = backend_dir / 'output' / 'logs'
-    
-    # 确保目录存在
-    log_dir.mkdir(parents=True, exist_ok=True)
-    
+
+    # 确保目录存在（先 isdir 探测，比无条件 mkdir(exist_ok=True) 便宜）
+    if not log_dir.is_dir():
+        log_dir.mkdir(parents=True, exist_ok=True)
+
     return log_dir
 
 
-def setup_logger(name: str, level: int = None) -> logging.Logger:
+_root_configured = False
+
+
+def _configure_root(level: int) -> None:
     """
-    配置并返回日志记录器
-    
-    Args:
-        name: 日志记录器名称
-        level: 日志级别（可选，默认从环境变量读取）
-        
-    Returns:
-        配置好的日志记录器
+    一次性配置根日志记录器
+
+    控制台 + 单一轮转文件 handler 只挂在根记录器上，命名记录器通过
+    propagate 复用，避免每个名字各开一份文件句柄并重复写盘。
     """
-    logger = logging.getLogger(name)
-    
-    # 避免重复添加 handler
-    if logger.handlers:
-        return logger
-    
-    # 从环境变量获取日志级别
-    if level is None:
-        level = get_log_level_from_env()
-    
-    logger.setLevel(level)
-    
+    global _root_configured
+    if _root_configured:
+        return
+    _root_configured = True
+
+    root = logging.getLogger()
+    root.setLevel(level)
+
     # 创建格式化器
     formatter = logging.Formatter(
         '[%(asctime)s] [%(name)s] [%(levelname)s] %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    
+
     # 1. 控制台处理器
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # 2. 文件处理器（带日志轮转）
+    handlers = [console_handler]
+
+    # 2. 文件处理器（带日志轮转），全部日志写入同一个 ReportGenX.log
+    file_handler_error = None
     try:
         log_dir = get_log_directory()
-        log_file = log_dir / f'{name}.log'
-        
+        log_file = log_dir / 'ReportGenX.log'
+
         # RotatingFileHandler: 单个文件最大 10MB，保留 5 个备份
         file_handler = RotatingFileHandler(
             filename=str(log_file),
@@ -113,11 +137,48 @@ def setup_logger(name: str, level: int = None) -> logging.Logger:
         )
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
     except Exception as e:
         # 如果文件日志创建失败，只使用控制台输出
-        logger.warning(f"Failed to create file handler: {e}")
-    
+        file_handler_error = e
+
+    # 3. 真实的控制台/文件处理器放到后台 QueueListener 线程，
+    #    调用线程只做一次无锁入队，磁盘写入和轮转检查不再阻塞生成路径
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setLevel(level)
+    root.addHandler(queue_handler)
+
+    if file_handler_error is not None:
+        root.warning(f"Failed to create file handler: {file_handler_error}")
+
+
+def setup_logger(name: str, level: int = None) -> logging.Logger:
+    """
+    配置并返回日志记录器
+
+    实际的 handler 只配置在根记录器上（见 _configure_root），
+    这里返回的命名记录器通过 propagate 复用同一组 handler。
+
+    Args:
+        name: 日志记录器名称
+        level: 日志级别（可选，默认从环境变量读取）
+
+    Returns:
+        配置好的日志记录器
+    """
+    # 从环境变量获取日志级别
+    if level is None:
+        level = get_log_level_from_env()
+
+    _configure_root(level)
+
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
     return logger
 
 
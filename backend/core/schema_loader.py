@@ -9,7 +9,11 @@ Based on _load_template() logic from template_manager.py (lines 319-458).
 """
 
 import os
-from typing import Any, Dict, Optional
+import sys
+from dataclasses import dataclass, field
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 import yaml
 
@@ -26,6 +30,56 @@ from .schema_models import (
 
 logger = setup_logger("SchemaLoader")
 
+# 优先使用 libyaml 的 C 解析器 (CSafeLoader)，与 template_manager 一致；
+# 未编译 libyaml 的安装退回纯 Python SafeLoader
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# 排序键：C 实现的 attrgetter，比逐元素调用 lambda 少一层 Python 帧
+_ORDER_KEY = attrgetter("order")
+
+# 取值集合很小、会被反复比较的字符串字段：构造模型前用 sys.intern 驻留，
+# 相同字面值跨实例共享一份内存，后续相等比较先走指针同一性
+_INTERNED_FIELD_KEYS = ('type', 'group', 'source', 'inline_group')
+
+
+def _intern_small_strings(data: Dict[str, Any]) -> Dict[str, Any]:
+    """就地驻留 data 中小基数字符串字段的值"""
+    for key in _INTERNED_FIELD_KEYS:
+        value = data.get(key)
+        if type(value) is str:
+            data[key] = sys.intern(value)
+    return data
+
+
+# TemplateInfo 中与 schema.yaml 顶层键同名的标量字段：
+# 直接按键名白名单取值，缺省交给 Pydantic 字段默认值处理
+_TEMPLATE_SCALAR_KEYS = (
+    "name", "description", "version", "order", "template_file",
+    "icon", "author", "create_time", "update_time",
+)
+
+@dataclass(frozen=True)
+class RuntimeConfig:
+    """runtime.yaml 的只读配置载体
+
+    冻结数据类的属性访问比逐次 dict.get 加默认值更快,
+    默认值也直接固化在字段定义里。
+    (不用 slots=True: 该参数要求 Python 3.10, 项目最低支持 3.9,
+    且每个模板只有一个配置实例, 省下的内存可以忽略)
+    """
+    log_prefix: str = ""
+    log_fields: Tuple[str, ...] = ()
+    db_table: str = ""
+    db_fields: Mapping[str, str] = field(default_factory=dict)
+    protected: bool = False
+
+
+# runtime.yaml 解析结果缓存: {runtime_path: (mtime, RuntimeConfig)}
+# 每次报告生成都会重新加载 runtime 配置,但其内容只在模板文件被修改时才变化;
+# 以 mtime 做失效条件,命中时直接返回冻结的配置实例,避免重复磁盘 IO
+# 和 YAML 解析,同时防止调用方意外修改共享配置
+_RUNTIME_CACHE: Dict[str, Tuple[float, RuntimeConfig]] = {}
+
 
 class SchemaLoader:
     """Reusable YAML -> Pydantic parsing for template schemas and runtime configs."""
@@ -51,12 +105,13 @@ class SchemaLoader:
         if not os.path.exists(schema_path):
             raise FileNotFoundError(f"schema.yaml not found in {template_dir}")
 
-        with open(schema_path, "r", encoding="utf-8") as f:
-            schema = yaml.safe_load(f)
+        # 二进制读取交给解析器做 UTF-8 解码，跳过文本层的逐行缓冲
+        with open(schema_path, "rb") as f:
+            schema = yaml.load(f, Loader=Loader)
 
         # Parse field groups
         field_groups = []
-        for idx, group_data in enumerate(schema.get("field_groups", [])):
+        for idx, group_data in enumerate(schema.get("field_groups") or ()):
             group_data.setdefault("id", f"group_{idx}")
             group_data.setdefault("order", idx)
             try:
@@ -64,36 +119,36 @@ class SchemaLoader:
                 field_groups.append(group)
             except Exception as e:
                 logger.warning(f"Invalid field group in {template_dir}: {e}")
-        field_groups.sort(key=lambda x: x.order)
+        field_groups.sort(key=_ORDER_KEY)
 
         # Parse data sources
         data_sources = []
-        for ds_data in schema.get("data_sources", []):
+        for ds_data in schema.get("data_sources") or ():
             try:
-                ds = DataSourceDef(**ds_data)
+                ds = DataSourceDef(**_intern_small_strings(ds_data))
                 data_sources.append(ds)
             except Exception as e:
                 logger.warning(f"Invalid data source in {template_dir}: {e}")
 
         # Parse field definitions
         fields = []
-        for idx, field_data in enumerate(schema.get("fields", [])):
+        for idx, field_data in enumerate(schema.get("fields") or ()):
             field_data.setdefault("order", idx)
             try:
-                field_def = FieldDefinition(**field_data)
+                field_def = FieldDefinition(**_intern_small_strings(field_data))
                 fields.append(field_def)
             except Exception as e:
                 logger.warning(
                     f"Invalid field '{field_data.get('key', 'unknown')}' in {template_dir}: {e}"
                 )
-        fields.sort(key=lambda x: x.order)
+        fields.sort(key=_ORDER_KEY)
 
         # Parse behaviors
         behaviors = []
-        for beh_data in schema.get("behaviors", []):
+        for beh_data in schema.get("behaviors") or ():
             trigger = beh_data.get("trigger", {})
             actions = []
-            for act_data in beh_data.get("actions", []):
+            for act_data in beh_data.get("actions") or ():
                 try:
                     action = BehaviorAction(**act_data)
                     actions.append(action)
@@ -114,7 +169,7 @@ class SchemaLoader:
         # Parse validation rules
         validation_rules = []
         validation_data = schema.get("validation", {})
-        for rule_data in validation_data.get("rules", []):
+        for rule_data in validation_data.get("rules") or ():
             try:
                 rule = ValidationRule(**rule_data)
                 validation_rules.append(rule)
@@ -123,18 +178,13 @@ class SchemaLoader:
 
         template_id = schema.get("id", os.path.basename(template_dir))
 
-        # Create TemplateInfo
+        # Create TemplateInfo：同名标量字段整体透传，缺省走模型默认值
+        scalar_kwargs = {k: schema[k] for k in _TEMPLATE_SCALAR_KEYS if k in schema}
+        scalar_kwargs.setdefault("name", template_id)
+        scalar_kwargs.setdefault("template_file", "template.docx")
         template_info = TemplateInfo(
             id=template_id,
-            name=schema.get("name", template_id),
-            description=schema.get("description", ""),
-            version=schema.get("version", "1.0.0"),
-            order=schema.get("order", 999),
-            template_file=schema.get("template_file", "template.docx"),
-            icon=schema.get("icon", ""),
-            author=schema.get("author", ""),
-            create_time=schema.get("create_time", ""),
-            update_time=schema.get("update_time", ""),
+            **scalar_kwargs,
             fields=fields,
             field_groups=field_groups,
             data_sources=data_sources,
@@ -144,35 +194,54 @@ class SchemaLoader:
             preview_config=schema.get("preview", {}),
             dependent_fields=schema.get("dependent_fields", {}),
             summary_configs=schema.get("summary_configs", {}),
+            raw_schema=schema,
         )
 
         return template_info
 
     @staticmethod
-    def load_runtime(template_dir: str) -> Dict[str, Any]:
+    def load_runtime(template_dir: str) -> RuntimeConfig:
         """
-        Read runtime.yaml from template_dir, return dict with handler config.
+        Read runtime.yaml from template_dir, return a frozen RuntimeConfig.
+
+        Results are cached by file mtime, so repeated report generations
+        skip the YAML parse and share one immutable config instance.
 
         Args:
             template_dir: Absolute path to template directory
 
         Returns:
-            Dict with keys: log_prefix, log_fields, db_table, db_fields
+            RuntimeConfig with log_prefix, log_fields, db_table, db_fields
 
         Raises:
             FileNotFoundError: If runtime.yaml does not exist
         """
         runtime_path = os.path.join(template_dir, "runtime.yaml")
 
-        if not os.path.exists(runtime_path):
+        try:
+            mtime = os.path.getmtime(runtime_path)
+        except OSError:
             raise FileNotFoundError(
                 f"runtime.yaml not found in {template_dir}. "
                 f"Template must have its own runtime.yaml with handler configuration."
             )
 
-        with open(runtime_path, "r", encoding="utf-8") as f:
-            runtime = yaml.safe_load(f) or {}
+        cached = _RUNTIME_CACHE.get(runtime_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(runtime_path, "rb") as f:
+            raw = yaml.load(f, Loader=Loader) or {}
+
+        runtime = RuntimeConfig(
+            log_prefix=str(raw.get("log_prefix") or ""),
+            log_fields=tuple(raw.get("log_fields") or ()),
+            db_table=str(raw.get("db_table") or ""),
+            db_fields=MappingProxyType(dict(raw.get("db_fields") or {})),
+            protected=bool(raw.get("protected", False)),
+        )
 
+        _RUNTIME_CACHE[runtime_path] = (mtime, runtime)
         return runtime
 
     @staticmethod
@@ -11,6 +11,7 @@ import them without creating import cycles.
 """
 
 import re
+import sys
 from typing import Any, Dict, List
 
 from pydantic import BaseModel, Field, field_validator
@@ -25,17 +26,26 @@ logger = setup_logger("SchemaModels")
 # =============================================================================
 
 # 允许的字段类型
-ALLOWED_FIELD_TYPES = {
+# frozenset + sys.intern：不可变集合防止运行期误改白名单，驻留的成员
+# 字符串让 in 判断先命中指针同一性比较（schema 加载侧同样驻留这些值）
+ALLOWED_FIELD_TYPES = frozenset(map(sys.intern, (
     'text', 'select', 'textarea', 'date', 'image', 'image_list',
     'searchable_select', 'checkbox', 'checkbox_group', 'number',
-    'array', 'widget', 'grouped_image_list'
-}
+    'array', 'widget', 'grouped_image_list',
+)))
 
 # 允许的数据源类型
-ALLOWED_DATA_SOURCE_TYPES = {'database', 'config', 'api'}
+ALLOWED_DATA_SOURCE_TYPES = frozenset(map(sys.intern, ('database', 'config', 'api')))
 
 # 允许的行为动作类型
-ALLOWED_ACTION_TYPES = {'api_call', 'compute', 'set_value'}
+ALLOWED_ACTION_TYPES = frozenset(map(sys.intern, ('api_call', 'compute', 'set_value')))
+
+# 模板 ID / 字段键名格式：字母或下划线开头，仅含字母数字下划线
+# 模块加载时编译一次；\Z 不像 $ 那样容忍末尾换行
+_IDENTIFIER_RE = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*\Z')
+
+# 语义化版本号 x.y.z；同样在模块加载时编译一次
+_SEMVER_RE = re.compile(r'^\d+\.\d+\.\d+\Z')
 
 
 # =============================================================================
@@ -65,12 +75,8 @@ def validate_template_id(template_id: str) -> bool:
         >>> validate_template_id("123test")
         False
     """
-    if not template_id:
-        return False
-
     # 只允许字母、数字、下划线，且不能以数字开头
-    pattern = r'^[a-zA-Z_][a-zA-Z0-9_]*$'
-    return bool(re.match(pattern, template_id))
+    return bool(template_id) and _IDENTIFIER_RE.match(template_id) is not None
 
 
 # =============================================================================
@@ -136,7 +142,7 @@ class FieldDefinition(BaseModel):
         """验证字段键名格式"""
         if not v:
             raise ValueError("Field key cannot be empty")
-        if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', v):
+        if not _IDENTIFIER_RE.match(v):
             logger.warning(f"Field key '{v}' does not follow snake_case convention")
         return v
 
@@ -226,6 +232,9 @@ class TemplateInfo(BaseModel):
     preview_config: Dict[str, Any] = Field(default_factory=dict)
     dependent_fields: Dict[str, Any] = Field(default_factory=dict)
     summary_configs: Dict[str, Any] = Field(default_factory=dict)
+    # 解析后的原始 schema 字典，供 resolve_data_sources 走嵌套 columns 时复用，
+    # 避免再次读盘解析；不参与序列化
+    raw_schema: Dict[str, Any] = Field(default_factory=dict, exclude=True, repr=False)
 
     @field_validator('id')
     @classmethod
@@ -239,6 +248,6 @@ class TemplateInfo(BaseModel):
     @classmethod
     def validate_version_format(cls, v: str) -> str:
         """验证版本号格式"""
-        if not re.match(r'^\d+\.\d+\.\d+$', v):
+        if not _SEMVER_RE.match(v):
             logger.warning(f"Version '{v}' does not follow semantic versioning (x.y.z)")
         return v
@@ -5,6 +5,7 @@
 消除 handler 中重复的 _generate_xxx_summary 方法，提供配置驱动的汇总生成
 """
 
+from collections import Counter
 from typing import Dict, Any, List, Tuple, Optional
 
 
@@ -67,18 +68,14 @@ class SummaryGenerator:
         if not items:
             return template_zero
         
-        # 统计各类型数量
-        type_counts = {}
-        for item in items:
-            t = item.get(type_key, '其他')
-            type_counts[t] = type_counts.get(t, 0) + 1
-        
+        # 统计各类型数量（Counter 的计数循环在 C 层完成）
+        type_counts = Counter(item.get(type_key, '其他') for item in items)
+
         # 生成描述部分
-        parts = []
-        for t, count in type_counts.items():
-            if count > 0:
-                name = type_names.get(t, f'{t}实例')
-                parts.append(f"{count}个{name}")
+        parts = [
+            f"{count}个{type_names.get(t, f'{t}实例')}"
+            for t, count in type_counts.items()
+        ]
         
         # 拼接描述
         if not parts:
@@ -120,22 +117,21 @@ class SummaryGenerator:
             return template_zero, 0
         
         # 按类型汇总数量
-        type_totals = {}
-        grand_total = 0
-        
+        type_totals = Counter()
+
         for item in items:
             data_type = item.get(type_key, '未知类型')
             count_str = item.get(count_key, '0')
-            
+
             # 解析数量（支持带逗号的数字）
             try:
                 count = int(str(count_str).replace(',', ''))
             except ValueError:
                 count = 0
-            
-            type_totals[data_type] = type_totals.get(data_type, 0) + count
-            grand_total += count
-        
+
+            type_totals[data_type] += count
+
+        grand_total = sum(type_totals.values())
         if grand_total == 0:
             return template_zero, 0
         
@@ -5,12 +5,26 @@
 支持版本管理、数据源解析、动态表单生成
 """
 
+import copy
+import importlib.util
+import json
 import os
+import shutil
+import sys
 import yaml
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from functools import lru_cache
+from operator import attrgetter
 import re
+
+try:
+    from packaging.version import InvalidVersion, Version
+except ImportError:  # packaging 未安装时回退到纯 int 元组比较
+    InvalidVersion = Version = None
+from .handler_registry import HandlerRegistry
 from .logger import setup_logger
 from .schema_models import (
     ALLOWED_FIELD_TYPES,
@@ -39,18 +53,122 @@ from .exceptions import (
 # 初始化日志记录器
 logger = setup_logger('TemplateManager')
 
+# 优先使用 libyaml 的 C 实现解析 YAML（快数倍），未编译 libyaml 时回退纯 Python
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# 模板排序键（按 order 字段），C 实现的 attrgetter 免去逐元素 lambda 调用
+_ORDER_KEY = attrgetter('order')
+
+# 文件名非法字符 -> 下划线 的转换表，str.translate 单次 C 层扫描即可完成清理
+_FILENAME_SANITIZE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+# 依赖声明里版本约束/extras 的起始字符，一次 split 取出包名
+# （requests>=2.28.0 / pyyaml==6.0 / pkg[extra] -> requests / pyyaml / pkg）
+_PKG_SPLIT_RE = re.compile(r'[<>=!\[]')
+
+
+class _SafeDict(dict):
+    """format_map 用的替换字典：未知占位符替换为空串而不是抛 KeyError"""
+
+    def __missing__(self, key):
+        return ''
+
+# 已解析 YAML 缓存: {path: (mtime, size, parsed_dict)}
+# 每次报告生成都会为嵌套 columns/依赖声明重读 schema.yaml,
+# 文件未变时直接返回缓存结果,省掉一次磁盘读 + 完整 YAML 解析
+_YAML_CACHE: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+_YAML_CACHE_MAX = 100
+
+
+def _load_yaml_cached(path: str) -> Any:
+    """
+    解析 YAML 文件，按 (mtime, size) 缓存结果
+
+    命中时返回缓存内容的深拷贝（下游可能会修改解析结果），
+    失效或未缓存时重新解析并写入 LRU 缓存。
+
+    Args:
+        path: YAML 文件路径
+
+    Returns:
+        解析后的数据（通常是 dict）
+
+    Raises:
+        OSError: 文件不存在或不可读
+        yaml.YAMLError: YAML 格式错误
+    """
+    st = os.stat(path)
+    entry = _YAML_CACHE.get(path)
+    if entry is not None and entry[0] == st.st_mtime and entry[1] == st.st_size:
+        _YAML_CACHE.move_to_end(path)
+        return copy.deepcopy(entry[2])
+
+    # 二进制打开：UTF-8 解码交给 YAML 解析器（libyaml 直接消费字节流），
+    # 省掉 Python 层的一次文本解码
+    with open(path, 'rb') as f:
+        parsed = yaml.load(f, Loader=Loader)
+
+    _YAML_CACHE[path] = (st.st_mtime, st.st_size, parsed)
+    _YAML_CACHE.move_to_end(path)
+    while len(_YAML_CACHE) > _YAML_CACHE_MAX:
+        _YAML_CACHE.popitem(last=False)
+    return copy.deepcopy(parsed)
+
+
+@lru_cache(maxsize=256)
+def _compile_validation_pattern(pattern: str) -> "re.Pattern":
+    """编译字段验证正则并缓存，校验循环里不再每次走 re 模块的缓存查找"""
+    return re.compile(pattern)
+
+
+@lru_cache(maxsize=128)
+def _parse_version(version: str):
+    """
+    解析版本号供比较使用（结果按版本字符串缓存）
+
+    packaging 可用时返回 Version（正确处理预发布号等语义），
+    否则返回 int 元组；无法解析时返回 None，由调用方回退字符串比较。
+    """
+    if Version is not None:
+        try:
+            return Version(version)
+        except InvalidVersion:
+            return None
+    try:
+        return tuple(map(int, version.split('.')))
+    except (ValueError, AttributeError):
+        return None
+
+
+def _safe_stat(path: str):
+    """os.stat 的容错版本：文件不存在或不可读时返回 None"""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=32)
+def _abs_base_prefix(base_dir: str) -> str:
+    """基础目录的绝对路径前缀（带结尾分隔符），按 base_dir 缓存"""
+    abs_base = os.path.abspath(base_dir)
+    return abs_base if abs_base.endswith(os.sep) else abs_base + os.sep
+
 
 def validate_path_safety(path: str, base_dir: str) -> bool:
     """
     验证路径安全性，防止路径遍历攻击（解决问题 12：安全风险）
-    
+
+    前缀比较带目录分隔符，避免 /a/b 误放行 /a/bc 这类同前缀兄弟目录；
+    基础目录的 abspath 结果按 base_dir 缓存，扫描循环中不再重复计算。
+
     Args:
         path: 要验证的路径
         base_dir: 基础目录
-        
+
     Returns:
         bool: 路径是否安全
-        
+
     Examples:
         >>> validate_path_safety("templates/vuln_report", "templates")
         True
@@ -59,11 +177,11 @@ def validate_path_safety(path: str, base_dir: str) -> bool:
     """
     try:
         # 规范化路径
+        prefix = _abs_base_prefix(base_dir)
         abs_path = os.path.abspath(os.path.join(base_dir, path))
-        abs_base = os.path.abspath(base_dir)
-        
-        # 检查路径是否在基础目录内
-        return abs_path.startswith(abs_base)
+
+        # 检查路径是否在基础目录内（等于基础目录本身也放行）
+        return abs_path.startswith(prefix) or abs_path == prefix[:-1]
     except Exception:
         return False
 
@@ -87,69 +205,111 @@ class TemplateManager:
         self.templates_dir = templates_dir
         self.config = config if config is not None else {}
         self._templates: Dict[str, TemplateInfo] = {}
-        self._template_versions: Dict[str, List[str]] = {}  # {template_id: [versions]}
+        # {template_id: [versions]}，列表保留加载顺序；伴生 set 提供 O(1) 去重判断
+        self._template_versions: Dict[str, List[str]] = defaultdict(list)
+        self._template_version_sets: Dict[str, set] = defaultdict(set)
         self._template_routers: Dict[str, Any] = {}  # 新增：存储模板路由
+        # 数据源解析计划缓存：模板结构加载后不变，预先展平成元组列表，
+        # resolve_data_sources 只需按计划逐项取配置
+        self._resolution_plans: Dict[str, Tuple[List, List, List, List]] = {}
+        # 替换计划缓存：{template_id: ((字段键, 占位符, 预解析默认值), ...)}
+        # 占位符字符串和默认值在加载时算好，build_replacements 只剩取值拼接
+        self._replacement_plans: Dict[str, Tuple[Tuple[str, str, Any], ...]] = {}
+        # 序列化后的前端 schema 缓存：{(template_id, version): dict}
+        self._schema_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # 预编码的 schema JSON 字节：HTTP 层可直接作为响应体返回
+        self._schema_json_cache: Dict[Tuple[str, str], bytes] = {}
+        # 已确认存在的输出目录：同一目录连续生成报告时跳过 makedirs 的 stat 链
+        self._ensured_dirs: set = set()
+        # 默认模板 ID 缓存（order 最小者），注册/删除模板时重算
+        self._default_template_id: Optional[str] = None
+        # 本管理器导入过的 handler 模块名，热重载时据此清理 sys.modules，
+        # 免去对整个 sys.modules 的前缀扫描
+        self._loaded_handler_modules: set = set()
+        # 依赖检查结果缓存：{template_id: (schema mtime, (是否满足, 缺失列表))}
+        self._dep_cache: Dict[str, Tuple[float, Tuple[bool, List[str]]]] = {}
+        # 模板 ID 快照，注册/删除时置空，template_ids 访问时按需重建
+        self._template_ids_cache: Optional[Tuple[str, ...]] = None
         self._load_all_templates()
     
     def _load_all_templates(self):
-        """扫描并加载所有模板"""
-        if not os.path.exists(self.templates_dir):
+        """扫描并加载所有模板
+
+        使用 os.scandir 遍历：DirEntry 自带目录项类型缓存，
+        相比 listdir + isdir 每个条目可省去一次 stat 系统调用。
+        """
+        try:
+            it = os.scandir(self.templates_dir)
+        except OSError:
             logger.warning(f"Templates directory not found: {self.templates_dir}")
             return
-        
-        for item in os.listdir(self.templates_dir):
-            # 跳过排除目录和隐藏目录（以 _ 或 . 开头）
-            if item in self.EXCLUDED_DIRS or item.startswith(('_', '.')):
-                logger.debug(f"Skipping excluded directory: {item}")
-                continue
-            
-            # 安全检查：防止路径遍历（解决问题 12）
-            if not validate_path_safety(item, self.templates_dir):
-                logger.warning(f"Skipping unsafe path: {item}")
-                continue
-            
-            template_path = os.path.join(self.templates_dir, item)
-            if not os.path.isdir(template_path):
+
+        tasks = []
+        with it:
+            for entry in it:
+                item = entry.name
+                # 跳过排除目录和隐藏目录（以 _ 或 . 开头）。
+                # scandir 返回的是纯目录项名（不含分隔符或 ..），
+                # 无需再做路径遍历检查；validate_path_safety 保留给
+                # 外部输入路径的调用场景
+                if item[:1] in '_.' or item in self.EXCLUDED_DIRS:
+                    logger.debug(f"Skipping excluded directory: {item}")
+                    continue
+
+                if not entry.is_dir():
+                    continue
+
+                schema_path = os.path.join(entry.path, "schema.yaml")
+                if os.path.exists(schema_path):
+                    tasks.append((item, schema_path))
+
+        if not tasks:
+            return
+
+        # 解析阶段并发执行（文件 IO + libyaml C 解析都释放 GIL）；
+        # 注册阶段（dict 写入、handler 动态导入会改 sys.modules）保持串行，
+        # 按扫描顺序处理，免去对共享状态加锁
+        if len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as executor:
+                parsed = list(executor.map(
+                    lambda t: self._parse_template(*t), tasks
+                ))
+        else:
+            parsed = [self._parse_template(*t) for t in tasks]
+
+        for (item, schema_path), template_info in zip(tasks, parsed):
+            if template_info is None:
                 continue
-            
-            schema_path = os.path.join(template_path, "schema.yaml")
-            if os.path.exists(schema_path):
-                self._load_template(item, schema_path)
+            # 单个模板注册失败只跳过该模板，不拖垮整个管理器的构造
+            try:
+                self._register_template(template_info, os.path.dirname(schema_path))
+            except Exception as e:
+                logger.exception(f"Failed to register template {item}: {e}")
     
-    def _load_template(self, template_id: str, schema_path: str):
+    def _parse_template(self, template_id: str, schema_path: str) -> Optional[TemplateInfo]:
         """
-        加载单个模板的 schema
-        
+        解析单个模板的 schema（纯解析，不写共享状态，可并发执行）
+
         Args:
             template_id: 模板ID (目录名)
             schema_path: schema.yaml 文件路径
+
+        Returns:
+            解析成功返回 TemplateInfo，失败返回 None
         """
         # 验证模板 ID 是否符合 Python 模块命名规范
         if not validate_template_id(template_id):
             logger.error(f"Invalid template ID format: {template_id}")
-            return
-        
+            return None
+
         template_dir = os.path.dirname(schema_path)
-        
+
         try:
             from .schema_loader import SchemaLoader
-            
+
             # Use SchemaLoader to parse schema.yaml into TemplateInfo
-            template_info = SchemaLoader.load_schema(template_dir)
-            
-            self._templates[template_info.id] = template_info
-            
-            # 版本管理
-            if template_info.id not in self._template_versions:
-                self._template_versions[template_info.id] = []
-            if template_info.version not in self._template_versions[template_info.id]:
-                self._template_versions[template_info.id].append(template_info.version)
-            
-            logger.info(f"Loaded template: {template_info.id} v{template_info.version} ({template_info.name})")
-            
-            # 动态加载 handler（阶段 1：任务 1.1）
-            self._load_handler(template_info.id, template_dir)
-            
+            return SchemaLoader.load_schema(template_dir)
+
         except FileNotFoundError as e:
             error = TemplateLoadError(template_id, str(e))
             logger.error(str(error))
@@ -161,17 +321,83 @@ class TemplateManager:
             logger.error(str(error))
         except Exception as e:
             error = TemplateLoadError(template_id, f"Unexpected error: {str(e)}")
-            logger.error(str(error))
-            import traceback
-            traceback.print_exc()
+            logger.exception(str(error))
+        return None
+
+    def _register_template(self, template_info: TemplateInfo, template_dir: str):
+        """
+        注册解析好的模板（写共享状态并导入 handler，只在主线程串行调用）
+
+        Args:
+            template_info: 解析完成的模板信息
+            template_dir: 模板目录路径
+        """
+        self._templates[template_info.id] = template_info
+
+        # 版本管理
+        known_versions = self._template_version_sets[template_info.id]
+        if template_info.version not in known_versions:
+            known_versions.add(template_info.version)
+            self._template_versions[template_info.id].append(template_info.version)
+
+        # 预计算数据源解析计划（模板加载后结构不再变化）
+        self._resolution_plans[template_info.id] = self._build_resolution_plan(template_info)
+
+        # 预计算替换计划：占位符和默认值对每个模板都是常量
+        self._replacement_plans[template_info.id] = self._build_replacement_plan(template_info)
+
+        # 预序列化前端 schema：加载时做一次 Pydantic -> dict 转换和 JSON 编码，
+        # /api/templates/{id}/schema 请求路径上不再有任何序列化开销
+        schema_key = (template_info.id, template_info.version)
+        schema_dict = self._build_template_schema(template_info)
+        self._schema_cache[schema_key] = schema_dict
+        # default=str 兜底 YAML 原生标量（如未加引号的日期会解析成
+        # datetime.date），行为与 FastAPI jsonable_encoder 的降级一致
+        self._schema_json_cache[schema_key] = json.dumps(
+            schema_dict, ensure_ascii=False, default=str
+        ).encode('utf-8')
+
+        logger.info(f"Loaded template: {template_info.id} v{template_info.version} ({template_info.name})")
+
+        self._template_ids_cache = None
+        self._recompute_default_template_id()
+
+        # 动态加载 handler（阶段 1：任务 1.1）
+        self._load_handler(template_info.id, template_dir)
+
+    def _load_template(self, template_id: str, schema_path: str):
+        """
+        加载单个模板的 schema（解析 + 注册的串行封装）
+
+        Args:
+            template_id: 模板ID (目录名)
+            schema_path: schema.yaml 文件路径
+        """
+        template_info = self._parse_template(template_id, schema_path)
+        if template_info is None:
+            return
+        try:
+            self._register_template(template_info, os.path.dirname(schema_path))
+        except Exception as e:
+            logger.exception(f"Failed to register template {template_id}: {e}")
     
+    # 审计通过记录：{handler 路径: (mtime_ns, size)}。审计结果只取决于
+    # 文件内容，文件未变时（热重载、重复实例化）跳过整个 AST 解析与遍历；
+    # 失败不缓存——失败会阻止加载，重审成本无关紧要
+    _audit_pass_cache: Dict[str, Tuple[int, int]] = {}
+
     def audit_code_security(self, template_id: str, file_path: str):
         """
         [Security Fix] 静态审计代码安全性
         检查 handler.py 是否包含禁止的导入或危险函数调用
         """
         import ast
-        
+
+        stat = _safe_stat(file_path)
+        if stat is not None:
+            if self._audit_pass_cache.get(file_path) == (stat.st_mtime_ns, stat.st_size):
+                return
+
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 tree = ast.parse(f.read())
@@ -200,6 +426,9 @@ class TemplateManager:
             logger.error(f"Code audit failed for {template_id}: {e}")
             raise ValueError(f"Rejected malicious code: {str(e)}")
 
+        if stat is not None:
+            self._audit_pass_cache[file_path] = (stat.st_mtime_ns, stat.st_size)
+
     def _check_module_name(self, template_id: str, module_name: str):
         """检查模块名是否在白名单中"""
         # 放行 core.* 内部模块
@@ -231,7 +460,18 @@ class TemplateManager:
         if not os.path.exists(handler_path):
             logger.warning(f"Handler not found for template: {template_id}")
             return
-        
+
+        # 已加载过则直接复用（热重载时 reload_templates 会先清掉 sys.modules 缓存），
+        # 避免重复 exec_module 触发二次 HandlerRegistry.register()
+        module_name = f"templates.{template_id}.handler"
+        cached_module = sys.modules.get(module_name)
+        if cached_module is not None:
+            self._loaded_handler_modules.add(module_name)
+            if hasattr(cached_module, 'router'):
+                self._template_routers[template_id] = cached_module.router
+            logger.info(f"Reusing loaded handler module for: {template_id}")
+            return
+
         # [Security Fix] 加载前先执行静态代码审计
         try:
             self.audit_code_security(template_id, handler_path)
@@ -240,11 +480,7 @@ class TemplateManager:
             return # 阻止加载
 
         try:
-            import importlib.util
-            import sys
-            
             # 动态加载模块
-            module_name = f"templates.{template_id}.handler"
             spec = importlib.util.spec_from_file_location(module_name, handler_path)
             if spec is None or spec.loader is None:
                 logger.error(f"Failed to create module spec for {template_id}")
@@ -254,7 +490,8 @@ class TemplateManager:
             
             # 添加到 sys.modules，避免重复加载
             sys.modules[module_name] = module
-            
+            self._loaded_handler_modules.add(module_name)
+
             # 执行模块（触发 HandlerRegistry.register()）
             spec.loader.exec_module(module)
             
@@ -294,7 +531,7 @@ class TemplateManager:
     def get_template_list(self) -> List[Dict[str, Any]]:
         """获取所有模板的简要列表（按 order 排序）"""
         # 先按 order 排序模板
-        sorted_templates = sorted(self._templates.values(), key=lambda t: t.order)
+        sorted_templates = sorted(self._templates.values(), key=_ORDER_KEY)
         
         return [
             {
@@ -327,28 +564,20 @@ class TemplateManager:
              0: version1 == version2
              1: version1 > version2
         """
-        try:
-            v1_parts = [int(x) for x in version1.split('.')]
-            v2_parts = [int(x) for x in version2.split('.')]
-            
-            # 补齐长度
-            max_len = max(len(v1_parts), len(v2_parts))
-            v1_parts.extend([0] * (max_len - len(v1_parts)))
-            v2_parts.extend([0] * (max_len - len(v2_parts)))
-            
-            for v1, v2 in zip(v1_parts, v2_parts):
-                if v1 < v2:
-                    return -1
-                elif v1 > v2:
-                    return 1
-            return 0
-        except (ValueError, AttributeError):
+        v1 = _parse_version(version1)
+        v2 = _parse_version(version2)
+
+        if v1 is None or v2 is None:
             # 如果版本号格式不正确，按字符串比较
-            if version1 < version2:
-                return -1
-            elif version1 > version2:
-                return 1
-            return 0
+            return (version1 > version2) - (version1 < version2)
+
+        if isinstance(v1, tuple):
+            # 补齐长度后按元组比较（C 层完成，等价于逐段 int 比较）
+            max_len = max(len(v1), len(v2))
+            v1 += (0,) * (max_len - len(v1))
+            v2 += (0,) * (max_len - len(v2))
+
+        return (v1 > v2) - (v1 < v2)
     
     def check_version_conflict(self, template_id: str, new_version: str) -> Tuple[bool, str]:
         """
@@ -379,43 +608,8 @@ class TemplateManager:
         
         return False, ""
     
-    def _serialize_field(self, field: FieldDefinition) -> Dict[str, Any]:
-        """
-        将字段定义序列化为字典
-        
-        Args:
-            field: 字段定义对象
-            
-        Returns:
-            字段字典（包含所有字段和额外字段）
-        """
-        return field.model_dump()
-    
-    def _serialize_field_group(self, group: FieldGroup) -> Dict[str, Any]:
-        """
-        将字段分组序列化为字典
-        
-        Args:
-            group: 字段分组对象
-            
-        Returns:
-            字段分组字典
-        """
-        return group.model_dump()
-    
-    def _serialize_data_source(self, ds: DataSourceDef) -> Dict[str, Any]:
-        """
-        将数据源定义序列化为字典
-        
-        Args:
-            ds: 数据源定义对象
-            
-        Returns:
-            数据源字典
-        """
-        return ds.model_dump()
-    
-    def _serialize_behavior(self, behavior: Behavior) -> Dict[str, Any]:
+    @staticmethod
+    def _serialize_behavior(behavior: Behavior) -> Dict[str, Any]:
         """
         将行为定义序列化为字典
         
@@ -434,23 +628,48 @@ class TemplateManager:
             "actions": [a.model_dump() for a in behavior.actions]
         }
     
-    @lru_cache(maxsize=128)
-    def _get_cached_schema(self, template_id: str, version: str) -> Optional[Dict[str, Any]]:
-        """
-        获取缓存的模板 schema（解决问题 13：性能优化）
-        
-        使用 LRU 缓存避免重复解析 schema
-        """
-        return self.get_template_schema(template_id)
-    
     def get_template_schema(self, template_id: str) -> Optional[Dict[str, Any]]:
         """
         获取模板的完整 schema (用于前端渲染表单)
+
+        结果按 (template_id, version) 缓存，命中时直接返回同一个字典；
+        调用方不应修改返回值（序列化层只读）。
         """
         template = self._templates.get(template_id)
         if not template:
             return None
-        
+
+        cache_key = (template_id, template.version)
+        cached = self._schema_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        schema = self._build_template_schema(template)
+        self._schema_cache[cache_key] = schema
+        return schema
+
+    def get_template_schema_bytes(self, template_id: str) -> Optional[bytes]:
+        """
+        获取模板 schema 的预编码 JSON 字节 (UTF-8)
+
+        HTTP 层可直接把返回值作为 application/json 响应体，
+        跳过每次请求的 dict -> JSON 编码。
+        """
+        template = self._templates.get(template_id)
+        if not template:
+            return None
+
+        cache_key = (template_id, template.version)
+        cached = self._schema_json_cache.get(cache_key)
+        if cached is None:
+            schema = self.get_template_schema(template_id)
+            # default=str 与注册时的预编码保持同一兜底策略
+            cached = json.dumps(schema, ensure_ascii=False, default=str).encode('utf-8')
+            self._schema_json_cache[cache_key] = cached
+        return cached
+
+    def _build_template_schema(self, template: TemplateInfo) -> Dict[str, Any]:
+        """序列化模板为前端 schema 字典"""
         return {
             "id": template.id,
             "name": template.name,
@@ -458,9 +677,9 @@ class TemplateManager:
             "version": template.version,
             "icon": template.icon,
             "author": template.author,
-            "field_groups": [self._serialize_field_group(g) for g in template.field_groups],
-            "fields": [self._serialize_field(f) for f in template.fields],
-            "data_sources": [self._serialize_data_source(ds) for ds in template.data_sources],
+            "field_groups": [g.model_dump() for g in template.field_groups],
+            "fields": [f.model_dump() for f in template.fields],
+            "data_sources": [ds.model_dump() for ds in template.data_sources],
             "behaviors": [self._serialize_behavior(b) for b in template.behaviors],
             "validation": {
                 "rules": [
@@ -491,61 +710,79 @@ class TemplateManager:
             return template_file
         return None
     
-    def resolve_data_sources(self, template_id: str, 
+    @staticmethod
+    def _build_resolution_plan(template: TemplateInfo) -> Tuple[List, List, List, List]:
+        """
+        预计算数据源解析计划（解决 resolve_data_sources 每次请求重复遍历的问题）
+
+        模板加载后 data_sources/fields/columns 不再变化，把类型判断和
+        'config.' 前缀解析提前到加载时完成，运行时只剩按键取值。
+
+        Returns:
+            (config 数据源, database 数据源, api 数据源, 字段级 config 来源)
+        """
+        plan_config = [(ds.id, ds.config_key) for ds in template.data_sources
+                       if ds.type == 'config' and ds.config_key]
+        plan_db = [ds.id for ds in template.data_sources if ds.type == 'database']
+        plan_api = [(ds.id, ds.endpoint) for ds in template.data_sources if ds.type == 'api']
+
+        # 字段级 source 与嵌套 columns 中的 source 统一展平为 (source, config_key)
+        plan_field_sources = []
+        seen = set()
+        for field in template.fields:
+            src = field.source
+            if src.startswith('config.') and src not in seen:
+                seen.add(src)
+                plan_field_sources.append((src, src.split('.', 1)[1]))
+        for field_data in template.raw_schema.get('fields', []):
+            for col in field_data.get('columns', []):
+                if isinstance(col, dict):
+                    src = col.get('source', '')
+                    if src.startswith('config.') and src not in seen:
+                        seen.add(src)
+                        plan_field_sources.append((src, src.split('.', 1)[1]))
+
+        return plan_config, plan_db, plan_api, plan_field_sources
+
+    def resolve_data_sources(self, template_id: str,
                              db_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         解析模板所需的数据源
-        
+
         Args:
             template_id: 模板ID
             db_data: 数据库数据 (如漏洞列表、ICP缓存等)
-            
+
         Returns:
             {source_id: data, ...}
         """
         template = self._templates.get(template_id)
         if not template:
             return {}
-        
+
+        plan = self._resolution_plans.get(template_id)
+        if plan is None:
+            plan = self._build_resolution_plan(template)
+            self._resolution_plans[template_id] = plan
+        plan_config, plan_db, plan_api, plan_field_sources = plan
+
         db_data = db_data if db_data is not None else {}
-        resolved = {}
-        
-        for ds in template.data_sources:
-            if ds.type == 'config' and ds.config_key:
-                # 从全局配置读取
-                resolved[ds.id] = self.config.get(ds.config_key, [])
-            elif ds.type == 'database':
-                # 从传入的数据库数据读取
-                resolved[ds.id] = db_data.get(ds.id, [])
-            elif ds.type == 'api':
-                # API 类型由前端处理
-                resolved[ds.id] = {"endpoint": ds.endpoint}
-        
-        # 处理字段级别的 source 属性 (如 config.risk_levels, config.supplierName)
-        for field in template.fields:
-            if field.source and field.source.startswith('config.'):
-                config_key = field.source.replace('config.', '')
-                if field.source not in resolved:
-                    resolved[field.source] = self.config.get(config_key, [])
-        
-        # 处理嵌套 columns 中的 source（需要读取原始 schema）
-        template_path = os.path.join(self.templates_dir, template_id)
-        schema_path = os.path.join(template_path, "schema.yaml")
-        if os.path.exists(schema_path):
-            try:
-                with open(schema_path, 'r', encoding='utf-8') as f:
-                    raw_schema = yaml.safe_load(f)
-                for field_data in raw_schema.get('fields', []):
-                    columns = field_data.get('columns', [])
-                    for col in columns:
-                        if isinstance(col, dict):
-                            src = col.get('source', '')
-                            if src.startswith('config.') and src not in resolved:
-                                config_key = src.replace('config.', '')
-                                resolved[src] = self.config.get(config_key, [])
-            except Exception as e:
-                logger.warning(f"Failed to parse columns from schema: {e}")
-        
+        config_get = self.config.get
+
+        # 从全局配置读取
+        resolved = {ds_id: config_get(key, []) for ds_id, key in plan_config}
+        # 从传入的数据库数据读取
+        for ds_id in plan_db:
+            resolved[ds_id] = db_data.get(ds_id, [])
+        # API 类型由前端处理
+        for ds_id, endpoint in plan_api:
+            resolved[ds_id] = {"endpoint": endpoint}
+
+        # 字段级别与嵌套 columns 的 config 来源 (如 config.risk_levels)
+        for src, config_key in plan_field_sources:
+            if src not in resolved:
+                resolved[src] = config_get(config_key, [])
+
         return resolved
     
     def validate_report_data(self, template_id: str, data: Dict[str, Any]) -> Tuple[bool, List[str]]:
@@ -560,34 +797,55 @@ class TemplateManager:
             return False, [f"Template not found: {template_id}"]
         
         errors = []
-        
-        # 检查必填字段
+
+        def _is_empty(value) -> bool:
+            # type() is 精确匹配比 isinstance 少一层子类检查；表单值不会是 str 子类
+            return not value or (type(value) is str and not value.strip())
+
+        # 检查必填字段；记录已判空的字段键，全局规则直接复用结论
+        # 每个字段只取一次值，必填分支和格式校验分支共用同一个局部变量
+        empty_keys = set()
         for field_def in template.fields:
-            if field_def.required:
-                value = data.get(field_def.key, "")
-                if not value or (isinstance(value, str) and not value.strip()):
-                    errors.append(f"字段 '{field_def.label}' 为必填项")
-            
-            # 检查字段验证规则
+            value = data.get(field_def.key, "")
+            if field_def.required and _is_empty(value):
+                empty_keys.add(field_def.key)
+                errors.append(f"字段 '{field_def.label}' 为必填项")
+
+            # 检查字段验证规则（正则按模式串缓存编译结果）
             if field_def.validation:
                 pattern = field_def.validation.get('pattern')
-                if pattern:
-                    value = data.get(field_def.key, "")
-                    if value and not re.match(pattern, str(value)):
-                        errors.append(field_def.validation.get('message', f"字段 '{field_def.label}' 格式不正确"))
+                if pattern and value and not _compile_validation_pattern(pattern).match(str(value)):
+                    errors.append(field_def.validation.get('message', f"字段 '{field_def.label}' 格式不正确"))
         
-        # 检查全局验证规则
+        # 检查全局验证规则（已判空的字段跳过重复的 isinstance/strip）
         for rule in template.validation_rules:
             if rule.rule == 'required':
                 for field_key in rule.fields:
-                    value = data.get(field_key, "")
-                    if not value or (isinstance(value, str) and not value.strip()):
+                    if field_key in empty_keys or _is_empty(data.get(field_key, "")):
                         errors.append(rule.message)
                         break
         
         return len(errors) == 0, errors
     
-    def build_replacements(self, template_id: str, data: Dict[str, Any], 
+    @staticmethod
+    def _build_replacement_plan(template: TemplateInfo) -> Tuple[Tuple[str, str, Any], ...]:
+        """
+        预计算模板的文本替换计划
+
+        每个条目为 (字段键, 占位符, 预解析默认值)：占位符优先取
+        template_placeholder，否则在加载时拼好 #key#；'today' 默认值
+        由前端填充，这里归一为空串。图片类字段交给专门的处理器，
+        不进入文本替换。
+        """
+        return tuple(
+            (field_def.key,
+             field_def.template_placeholder or f"#{field_def.key}#",
+             field_def.default if field_def.default != 'today' else '')
+            for field_def in template.fields
+            if field_def.type not in ('image', 'image_list', 'grouped_image_list')
+        )
+
+    def build_replacements(self, template_id: str, data: Dict[str, Any],
                           extra: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
         """
         根据模板定义和数据构建替换字典
@@ -600,43 +858,49 @@ class TemplateManager:
         Returns:
             替换字典 {"#key#": "value", ...}
         """
-        template = self._templates.get(template_id)
-        if not template:
+        plan = self._replacement_plans.get(template_id)
+        if plan is None:
             return {}
-        
-        replacements = {}
-        
-        # 从模板字段构建
-        for field_def in template.fields:
-            # 优先使用模板中定义的占位符
-            if field_def.template_placeholder:
-                key = field_def.template_placeholder
-            else:
-                key = f"#{field_def.key}#"
-            
-            value = data.get(field_def.key)
-            if value is None:
-                value = field_def.default if field_def.default != 'today' else ''
-            
-            # 特殊处理：跳过图片类型和复杂类型，由专门的处理器处理
-            if field_def.type in ('image', 'image_list', 'grouped_image_list'):
-                continue
-            if isinstance(value, list):
-                # 图片列表等复杂类型，跳过文本替换
-                continue
-            else:
-                replacements[key] = str(value) if value is not None else ""
-        
+
+        data_get = data.get
+
+        def _field_items():
+            for key, placeholder, default in plan:
+                value = data_get(key)
+                if value is None:
+                    value = default
+                if isinstance(value, list):
+                    # 图片列表等复杂类型，跳过文本替换
+                    continue
+                yield (placeholder, "" if value is None else str(value))
+
+        # 从预计算的替换计划构建（dict() 一次吞掉生成器，省去逐键赋值的字节码开销）
+        replacements = dict(_field_items())
+
         # 合并额外数据
         if extra:
-            for k, v in extra.items():
-                if not k.startswith("#"):
-                    k = f"#{k}#"
-                replacements[k] = str(v) if v is not None else ""
-        
+            replacements.update(
+                (k if k.startswith("#") else f"#{k}#",
+                 "" if v is None else str(v))
+                for k, v in extra.items()
+            )
+
         return replacements
     
-    def generate_output_path(self, template_id: str, data: Dict[str, Any], 
+    @staticmethod
+    def _expand_pattern(pattern: str, replacements: "_SafeDict") -> str:
+        """用 format_map 单次扫描展开 {var} 占位符；模式不兼容 format 时回退逐键替换"""
+        try:
+            return pattern.format_map(replacements)
+        except Exception:
+            # 不成对的花括号 (ValueError)、属性/下标访问如 {a.b}、{a[0]}
+            # (AttributeError/TypeError/IndexError) 等任何 format_map
+            # 消化不了的模式，都退回基线的逐键替换，未知占位符原样保留
+            for key, value in replacements.items():
+                pattern = pattern.replace(f'{{{key}}}', value)
+            return pattern
+
+    def generate_output_path(self, template_id: str, data: Dict[str, Any],
                             base_output_dir: str) -> str:
         """
         根据模板配置生成输出路径
@@ -659,35 +923,40 @@ class TemplateManager:
         filename_pattern = output_config.get('filename_pattern', '{vul_name}_{date}.docx')
         output_dir_pattern = output_config.get('output_dir', '')
         
-        # 替换变量
-        now = datetime.now()
-        replacements = {
-            'date': now.strftime('%Y-%m-%d'),
-            'datetime': now.strftime('%Y%m%d_%H%M%S'),
-            'timestamp': str(int(now.timestamp()))
-        }
-        replacements.update(data)
-        
-        # 解析文件名
-        filename = filename_pattern
-        for key, value in replacements.items():
-            filename = filename.replace(f'{{{key}}}', str(value) if value else '')
-        
-        # 清理文件名中的非法字符
-        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-        
+        # 替换变量：统一预转字符串，format_map 一次扫描完成所有占位符替换；
+        # 时间占位符只在模式串真正用到时才计算（strftime 带时区查找，不便宜）
+        replacements = _SafeDict()
+        combined_pattern = filename_pattern + '|' + output_dir_pattern
+        needs_date = '{date}' in combined_pattern
+        needs_datetime = '{datetime}' in combined_pattern
+        needs_timestamp = '{timestamp}' in combined_pattern
+        if needs_date or needs_datetime or needs_timestamp:
+            now = datetime.now()
+            if needs_date:
+                replacements['date'] = now.strftime('%Y-%m-%d')
+            if needs_datetime:
+                replacements['datetime'] = now.strftime('%Y%m%d_%H%M%S')
+            if needs_timestamp:
+                replacements['timestamp'] = str(int(now.timestamp()))
+        for key, value in data.items():
+            replacements[key] = str(value) if value else ''
+
+        # 解析文件名并清理非法字符
+        filename = self._expand_pattern(filename_pattern, replacements)
+        filename = filename.translate(_FILENAME_SANITIZE)
+
         # 解析输出目录
         if output_dir_pattern:
-            output_dir = output_dir_pattern
-            for key, value in replacements.items():
-                output_dir = output_dir.replace(f'{{{key}}}', str(value) if value else '')
+            output_dir = self._expand_pattern(output_dir_pattern, replacements)
             output_dir = os.path.join(base_output_dir, output_dir)
         else:
             output_dir = base_output_dir
         
-        # 确保目录存在
-        os.makedirs(output_dir, exist_ok=True)
-        
+        # 确保目录存在（已创建过的目录跳过系统调用）
+        if output_dir not in self._ensured_dirs:
+            os.makedirs(output_dir, exist_ok=True)
+            self._ensured_dirs.add(output_dir)
+
         return os.path.join(output_dir, filename)
     
     # Security: 允许的依赖包白名单
@@ -730,6 +999,21 @@ class TemplateManager:
         'python-dateutil', 'pytz', 'typing-extensions', 'click', 'colorama'
     }
 
+    # 包可用性检查结果缓存（进程级，包的安装状态运行期间不变）
+    _import_check_cache: Dict[str, bool] = {}
+
+    @classmethod
+    def _package_available(cls, pkg_name: str) -> bool:
+        """检查包是否可导入；用 find_spec 免去真正执行模块顶层代码，结果缓存"""
+        available = cls._import_check_cache.get(pkg_name)
+        if available is None:
+            try:
+                available = importlib.util.find_spec(pkg_name) is not None
+            except (ImportError, ValueError):
+                available = False
+            cls._import_check_cache[pkg_name] = available
+        return available
+
     def check_dependencies(self, template_id: str, raise_on_missing: bool = False) -> Tuple[bool, List[str]]:
         """
         检查模板依赖是否满足（解决问题 9：模板依赖管理缺失）
@@ -755,23 +1039,30 @@ class TemplateManager:
         # 从模板目录读取 schema.yaml 获取依赖声明
         template_path = os.path.join(self.templates_dir, template_id)
         schema_path = os.path.join(template_path, "schema.yaml")
-        
-        if not os.path.exists(schema_path):
+
+        schema_stat = _safe_stat(schema_path)
+        if schema_stat is None:
             return True, []
-        
+
+        # schema 未变则直接返回上次结果（抛异常路径走完整检查以保留精确报错）
+        if not raise_on_missing:
+            cached = self._dep_cache.get(template_id)
+            if cached is not None and cached[0] == schema_stat.st_mtime:
+                return cached[1]
+
         try:
-            with open(schema_path, 'r', encoding='utf-8') as f:
-                schema = yaml.safe_load(f)
-            
+            schema = _load_yaml_cached(schema_path)
+
             dependencies = schema.get('dependencies', [])
             if not dependencies:
+                self._dep_cache[template_id] = (schema_stat.st_mtime, (True, []))
                 return True, []
             
             missing = []
             for dep in dependencies:
-                # 格式解析：requests>=2.28.0 -> requests
-                pkg_name = dep.split('>=')[0].split('==')[0].split('<')[0].split('[')[0].strip().lower()
-                
+                # 格式解析：requests>=2.28.0 -> requests（一次正则 split 取包名）
+                pkg_name = _PKG_SPLIT_RE.split(dep, 1)[0].strip().lower()
+
                 # Security Check: 白名单验证
                 if pkg_name not in self.ALLOWED_PACKAGES:
                     logger.warning(f"Security Alert: Template {template_id} requests unapproved dependency '{pkg_name}'")
@@ -780,20 +1071,20 @@ class TemplateManager:
                     missing.append(f"{dep} (Unapproved)")
                     continue
 
-                try:
-                    # 简单检查：尝试导入包名
-                    __import__(pkg_name)
-                except ImportError:
+                if not self._package_available(pkg_name):
                     missing.append(dep)
             
             if missing:
                 logger.warning(f"Template {template_id} has missing dependencies: {missing}")
                 if raise_on_missing:
                     raise DependencyError(template_id, missing)
-                return False, missing
-            
-            return True, []
-            
+                result = (False, missing)
+            else:
+                result = (True, [])
+
+            self._dep_cache[template_id] = (schema_stat.st_mtime, result)
+            return result
+
         except DependencyError:
             raise
         except Exception as e:
@@ -805,9 +1096,7 @@ class TemplateManager:
     
     def reload_templates(self):
         """重新加载所有模板"""
-        import sys
-        from .base_handler import HandlerRegistry
-        
+
         # 清理 HandlerRegistry（解决问题 7：重复注册问题）
         HandlerRegistry.clear()
         logger.info("Cleared HandlerRegistry")
@@ -816,21 +1105,26 @@ class TemplateManager:
         self._template_routers.clear()
         
         # 清理 sys.modules 中的旧模块（解决问题 6：sys.modules 缓存问题）
-        modules_to_remove = []
-        for module_name in sys.modules.keys():
-            if module_name.startswith('templates.') and '.handler' in module_name:
-                modules_to_remove.append(module_name)
-        
-        for module_name in modules_to_remove:
-            del sys.modules[module_name]
-            logger.info(f"Removed old module from cache: {module_name}")
-        
-        # 清理 LRU 缓存（解决问题 13：性能优化）
-        self._get_cached_schema.cache_clear()
+        # 只处理本管理器记录过的 handler 模块，不再全量扫描 sys.modules
+        for module_name in self._loaded_handler_modules:
+            if sys.modules.pop(module_name, None) is not None:
+                logger.info(f"Removed old module from cache: {module_name}")
+        self._loaded_handler_modules.clear()
+        
+        # 清理序列化 schema 缓存（解决问题 13：性能优化）
+        self._schema_cache.clear()
+        self._schema_json_cache.clear()
+        self._ensured_dirs.clear()
+        self._dep_cache.clear()
         logger.info("Cleared schema cache")
-        
+
         self._templates.clear()
         self._template_versions.clear()
+        self._template_version_sets.clear()
+        self._resolution_plans.clear()
+        self._replacement_plans.clear()
+        self._default_template_id = None
+        self._template_ids_cache = None
         self._load_all_templates()
     
     def get_template_details(self, template_id: str) -> Optional[Dict[str, Any]]:
@@ -851,13 +1145,15 @@ class TemplateManager:
         schema_path = os.path.join(template_path, "schema.yaml")
         docx_path = os.path.join(template_path, "template.docx")
         
-        # 获取文件大小
-        schema_size = os.path.getsize(schema_path) if os.path.exists(schema_path) else 0
-        docx_size = os.path.getsize(docx_path) if os.path.exists(docx_path) else 0
+        # 一次 stat 同时拿到存在性、大小和修改时间（每个文件只发一次系统调用）
+        schema_stat = _safe_stat(schema_path)
+        docx_stat = _safe_stat(docx_path)
+
+        schema_size = schema_stat.st_size if schema_stat else 0
+        docx_size = docx_stat.st_size if docx_stat else 0
         total_size = schema_size + docx_size
-        
-        # 获取文件修改时间
-        mtime = os.path.getmtime(schema_path) if os.path.exists(schema_path) else 0
+
+        mtime = schema_stat.st_mtime if schema_stat else 0
         update_time = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S") if mtime else ""
         
         return {
@@ -874,8 +1170,8 @@ class TemplateManager:
             "group_count": len(template.field_groups),
             "file_size": total_size,
             "file_size_mb": round(total_size / 1024 / 1024, 2),
-            "has_schema": os.path.exists(schema_path),
-            "has_docx": os.path.exists(docx_path),
+            "has_schema": schema_stat is not None,
+            "has_docx": docx_stat is not None,
             "is_default": template.id == self.default_template_id
         }
     
@@ -889,8 +1185,6 @@ class TemplateManager:
         Returns:
             (成功标志, 消息)
         """
-        import shutil
-        
         # 检查模板是否存在
         if template_id not in self._templates:
             return False, f"模板不存在: {template_id}"
@@ -900,7 +1194,11 @@ class TemplateManager:
             return False, "无法删除唯一的模板"
         
         template_path = os.path.join(self.templates_dir, template_id)
-        
+
+        # 安全检查：模板 ID 来自外部输入，删除前确认路径在模板目录内
+        if not validate_path_safety(template_id, self.templates_dir):
+            return False, f"非法的模板路径: {template_id}"
+
         try:
             # 删除模板目录
             if os.path.exists(template_path):
@@ -911,7 +1209,17 @@ class TemplateManager:
             del self._templates[template_id]
             if template_id in self._template_versions:
                 del self._template_versions[template_id]
-            
+            self._template_version_sets.pop(template_id, None)
+            self._resolution_plans.pop(template_id, None)
+            self._replacement_plans.pop(template_id, None)
+            self._schema_cache = {k: v for k, v in self._schema_cache.items()
+                                  if k[0] != template_id}
+            self._schema_json_cache = {k: v for k, v in self._schema_json_cache.items()
+                                       if k[0] != template_id}
+            self._template_ids_cache = None
+            self._recompute_default_template_id()
+            self._dep_cache.pop(template_id, None)
+
             return True, f"模板 {template_id} 已删除"
         except Exception as e:
             logger.error(f"Failed to delete template {template_id}: {str(e)}")
@@ -922,15 +1230,20 @@ class TemplateManager:
         self.config = config
     
     @property
-    def template_ids(self) -> List[str]:
-        """获取所有模板ID"""
-        return list(self._templates.keys())
+    def template_ids(self) -> Tuple[str, ...]:
+        """获取所有模板ID（不可变快照，重复访问零拷贝）"""
+        if self._template_ids_cache is None:
+            self._template_ids_cache = tuple(self._templates.keys())
+        return self._template_ids_cache
     
+    def _recompute_default_template_id(self):
+        """重算默认模板ID（order 最小者），O(n) 求 min 而非每次访问排序"""
+        if self._templates:
+            self._default_template_id = min(self._templates.values(), key=_ORDER_KEY).id
+        else:
+            self._default_template_id = None
+
     @property
     def default_template_id(self) -> Optional[str]:
         """获取默认模板ID (order 最小的模板)"""
-        if self._templates:
-            # 按 order 排序，返回第一个
-            sorted_templates = sorted(self._templates.values(), key=lambda t: t.order)
-            return sorted_templates[0].id if sorted_templates else None
-        return None
+        return self._default_template_id
@@ -158,8 +158,7 @@ def generate(data: Dict[str, Any], ctx: Any) -> Tuple[bool, str, str]:
         return True, final_path, "Intrusion report generated successfully"
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        ctx.logger.exception(f"Report generation failed: {e}")
         return False, "", f"Report generation failed: {str(e)}"
 
 
@@ -213,11 +212,11 @@ def execute(
     if success:
         ctx.postprocess(
             path, processed,
-            log_prefix=runtime_cfg.get('log_prefix', ''),
-            log_fields=runtime_cfg.get('log_fields', []),
-            db_table=runtime_cfg.get('db_table', ''),
+            log_prefix=runtime_cfg.log_prefix,
+            log_fields=runtime_cfg.log_fields,
+            db_table=runtime_cfg.db_table,
             db_name=f"{datetime.now().strftime('%Y-%m-%d')}_output.db",
-            db_field_map=runtime_cfg.get('db_fields', {}),
+            db_field_map=runtime_cfg.db_fields,
         )
 
     return {